@@ -2,9 +2,14 @@
 Init for sqlite-clean
 """
 from .fix import (
+    apply_fixes,
     clean_like_nulls,
     update_columns_to_nullable,
     update_values_like_null_to_null,
 )
-from .lint import contains_conflicting_aff_storage_class, contains_str_like_null
+from .lint import (
+    contains_conflicting_aff_storage_class,
+    contains_str_like_null,
+    lint_database,
+)
 from .utils import collect_columns, engine_from_str
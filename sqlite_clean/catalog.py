@@ -1,9 +1,17 @@
 """
 sqlite-clean catalog - intended to be used for cataloging various linting and
 fixing operations found within this repo.
+
+Lint entries include a column-level "predicate" which is used to check
+all lint rules together (see sqlite_clean.lint.lint_database).
 """
 from .fix import clean_like_nulls
-from .lint import contains_conflicting_aff_storage_class, contains_str_like_null
+from .lint import (
+    _conflicting_aff_storage_class_predicate,
+    _str_like_null_predicate,
+    contains_conflicting_aff_storage_class,
+    contains_str_like_null,
+)
 
 SQLITE_CLEAN_CATALOG = {
     "lint": [
@@ -14,6 +22,7 @@ SQLITE_CLEAN_CATALOG = {
                 " See https://www.sqlite.org/datatype3.html for more information"
             ),
             "ref": contains_conflicting_aff_storage_class,
+            "predicate": _conflicting_aff_storage_class_predicate,
         },
         {
             "id": "L0002",
@@ -22,6 +31,7 @@ SQLITE_CLEAN_CATALOG = {
                 "null-like values. Consider using SQLite NULL values instead."
             ),
             "ref": contains_str_like_null,
+            "predicate": _str_like_null_predicate,
         },
     ],
     "fix": [
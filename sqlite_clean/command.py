@@ -8,6 +8,8 @@ import click
 
 from sqlite_clean.catalog import SQLITE_CLEAN_CATALOG
 from sqlite_clean.constants import LIKE_NULLS
+from sqlite_clean.fix import apply_fixes
+from sqlite_clean.lint import contains_str_like_null, lint_database
 
 
 @click.group()
@@ -36,28 +38,73 @@ def cli():
     default=",".join(LIKE_NULLS),
     help="Optional list of null-like values to pass in for linting actions.",
 )
+@click.option(
+    "--materialize",
+    is_flag=True,
+    default=False,
+    help="Create and use indexes of null-like values within the database.",
+)
+@click.option(
+    "--persist",
+    is_flag=True,
+    default=False,
+    help=(
+        "Keep indexes created through --materialize within the database"
+        " to speed up repeated linting and fixing."
+    ),
+)
 def lint(
     sql_engine: str,
+    *,
     table_name: Optional[str],
     column_name: Optional[str],
     like_nulls: str,
+    materialize: bool = False,
+    persist: bool = False,
 ):
     """
     Runs sqlite-clean linting functionality through command-line
     """
 
+    # pylint: disable=too-many-arguments
+
     # click doesn't allow for variable length tuple options
     # as a result we input a string for like_nulls and
     # recompose into tuple here for compatibility with linting ops
     like_nulls_tuple = tuple(like_nulls.split(","))
 
-    for func in [item["ref"] for item in SQLITE_CLEAN_CATALOG["lint"]]:
-        func(  # type: ignore
-            sql_engine=sql_engine,
-            table_name=table_name,
-            column_name=column_name,
-            like_nulls=like_nulls_tuple,
-        )
+    lint_rules = SQLITE_CLEAN_CATALOG["lint"]
+
+    # with materialized indexes, null-like values are detected through index
+    # probes and the table scan below only needs to check for them if found
+    if materialize and not contains_str_like_null(
+        sql_engine=sql_engine,
+        table_name=table_name,
+        column_name=column_name,
+        like_nulls=like_nulls_tuple,
+        materialize=True,
+        persist=persist,
+    ):
+        lint_rules = [
+            rule for rule in lint_rules if rule["ref"] is not contains_str_like_null
+        ]
+
+    # check all lint rules from the catalog within a single pass
+    issues = lint_database(
+        sql_engine=sql_engine,
+        lint_rules=lint_rules,
+        table_name=table_name,
+        column_name=column_name,
+        like_nulls=like_nulls_tuple,
+    )
+
+    if issues:
+        for issue in issues:
+            click.echo(
+                f"{issue['id']} {issue['table_name']}.{issue['column_name']}: "
+                f"{issue['desc']}"
+            )
+        raise click.exceptions.Exit(1)
 
     click.echo("Database linted, no issues detected!")
 
@@ -84,18 +131,37 @@ def lint(
     default=True,
     help=".",
 )
+@click.option(
+    "--strict",
+    is_flag=True,
+    default=False,
+    help="Run a full integrity check of the database before committing fixes.",
+)
 def fix(
     sql_engine: str,
+    *,
     dest_path: Optional[str] = None,
     table_name: Optional[str] = None,
     column_name: Optional[str] = None,
     inplace: bool = True,
+    strict: bool = False,
 ):
     """
     Runs sqlite-clean fix functionality through command-line
     """
-    for func in [item["ref"] for item in SQLITE_CLEAN_CATALOG["fix"]]:
-        func(sql_engine, dest_path, table_name, column_name, inplace)  # type: ignore
+
+    # pylint: disable=too-many-arguments
+
+    # apply all fixes from the catalog within a single transaction
+    apply_fixes(
+        sql_engine=sql_engine,
+        fix_rules=SQLITE_CLEAN_CATALOG["fix"],
+        dest_path=dest_path,
+        table_name=table_name,
+        column_name=column_name,
+        inplace=inplace,
+        strict=strict,
+    )
 
     if not dest_path:
         dest_path = sql_engine
@@ -2,45 +2,41 @@
 SQLite-clean constants to be used in other areas of this library.
 """
 
-# A reference dictionary for SQLite affinity and storage class types
-# See more here: https://www.sqlite.org/datatype3.html#affinity_name_examples
-SQLITE_AFF_REF = {
-    "INTEGER": [
-        "INT",
-        "INTEGER",
-        "TINYINT",
-        "SMALLINT",
-        "MEDIUMINT",
-        "BIGINT",
-        "UNSIGNED BIG INT",
-        "INT2",
-        "INT8",
-    ],
-    "TEXT": [
-        "CHARACTER",
-        "VARCHAR",
-        "VARYING CHARACTER",
-        "NCHAR",
-        "NATIVE CHARACTER",
-        "NVARCHAR",
-        "TEXT",
-        "CLOB",
-    ],
-    "BLOB": ["BLOB"],
-    "REAL": [
-        "REAL",
-        "DOUBLE",
-        "DOUBLE PRECISION",
-        "FLOAT",
-    ],
-    "NUMERIC": [
-        "NUMERIC",
-        "DECIMAL",
-        "BOOLEAN",
-        "DATE",
-        "DATETIME",
-    ],
+# SQL lists of valid data storage classes (as returned by TYPEOF) for each
+# SQLite affinity type, following the type affinity rules described here:
+# https://www.sqlite.org/datatype3.html#type_affinity
+AFFINITY_VALID_STORAGE_SQL = {
+    "INTEGER": "('integer','null')",
+    "TEXT": "('text','null')",
+    "BLOB": "('blob','null')",
+    "REAL": "('real','integer','null')",
+    "NUMERIC": "('integer','real','text','null')",
 }
 
+# limits for the checks performed within a single query, keeping below
+# SQLite's maximum expression tree depth (1000) and result columns (2000),
+# along with the maximum number of bound parameters for SQLite versions
+# prior to 3.32.0 (999). See more here: https://www.sqlite.org/limits.html
+SQLITE_MAX_CHECKS_PER_QUERY = 250
+SQLITE_MAX_VARIABLE_NUMBER = 999
+
+# pragmas applied to sqlite3 connections used for database fixes in order to
+# reduce disk syncs. See more here: https://www.sqlite.org/pragma.html
+SQLITE_WRITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL;",
+    "PRAGMA synchronous=NORMAL;",
+    "PRAGMA temp_store=MEMORY;",
+    # negative values are in kibibytes, here 64 MiB
+    "PRAGMA cache_size=-65536;",
+)
+
 # strings which may represent null values
 LIKE_NULLS = ("null", "none", "nan")
+
+# lowercase variant of LIKE_NULLS for case-insensitive comparisons
+# note: duplicates which differ only by case are removed, keeping order
+LIKE_NULLS_LOWER = tuple(dict.fromkeys(val.lower() for val in LIKE_NULLS))
+
+# name prefix for partial indexes of strings like nulls
+# created through opt-in materialization when linting
+LIKE_NULL_INDEX_PREFIX = "_sqlite_clean_like_null_"
@@ -4,152 +4,409 @@ sqlite-clean fixes - Applying fixes for SQLite databases.
 
 import logging
 import os
+import re
 import sqlite3
-from typing import Optional, Tuple, Union
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
 
 from sqlalchemy.engine.base import Engine
 
-from sqlite_clean.constants import LIKE_NULLS
-from sqlite_clean.lint import contains_str_like_null
-from sqlite_clean.utils import collect_columns, engine_from_str
+from sqlite_clean.constants import LIKE_NULLS, SQLITE_WRITE_PRAGMAS
+from sqlite_clean.utils import (
+    _build_like_null_index_sql,
+    _connection_columns,
+    _group_columns_by_table,
+    _is_memory_database,
+    _like_null_indexes,
+    _like_null_params,
+    _like_null_predicate,
+    _max_of_predicates,
+    _quote_identifier,
+    _raw_connection,
+    _refresh_file_identity,
+    collect_columns,
+    engine_from_str,
+)
 
 logger = logging.getLogger(__name__)
 
+# matches the tokens of table sql which are needed to find NOT NULL column
+# constraints: string literals, quoted identifiers and comments (which are
+# skipped over), parentheses, and NOT NULL (including whitespace variants
+# accepted by SQLite and an optional conflict clause) without matching
+# words such as NULLABLE
+_NOT_NULL_TOKEN_RE = re.compile(
+    r"""'(?:[^']|'')*'|"(?:[^"]|"")*"|`(?:[^`]|``)*`|\[[^\]]*\]"""
+    r"|--[^\n]*|/\*.*?(?:\*/|$)"
+    r"|[()]"
+    r"|\bNOT\s+NULL(?:\s+ON\s+CONFLICT\s+\w+)?\b",
+    re.IGNORECASE | re.DOTALL,
+)
+
+
+def _remove_not_null(table_sql: str) -> str:
+    """
+    Remove NOT NULL column constraints from CREATE TABLE sql.
 
-def update_columns_to_nullable(
-    sql_engine: Union[str, Engine],
-    dest_path: Optional[str] = None,
-    table_name: Optional[str] = None,
-    inplace: bool = True,
+    Special notes:
+    - Only NOT NULL directly within the column definitions is removed.
+    NOT NULL within nested expressions (for ex. CHECK (col IS NOT NULL))
+    as well as within string literals, quoted identifiers and comments
+    is left as-is.
+
+    Parameters
+    ----------
+    table_sql: str
+        CREATE TABLE sql as found within sqlite_master
+
+    Returns
+    -------
+    str
+        The table sql without NOT NULL column constraints.
+    """
+
+    # parenthesis depth, where column definitions are found at depth 1
+    depth = 0
+
+    def replace(match: re.Match) -> str:
+        nonlocal depth
+        token = match.group(0)
+        if token == "(":
+            depth += 1
+        elif token == ")":
+            depth -= 1
+        elif depth == 1 and token[:3].upper() == "NOT":
+            return ""
+        return token
+
+    return _NOT_NULL_TOKEN_RE.sub(replace, table_sql)
+
+
+@contextmanager
+def _write_connection(engine: Engine) -> Iterator[sqlite3.Connection]:
+    """
+    Provide the underlying sqlite3 connection from the engine's pool with
+    autocommit disabled and pragmas which reduce disk syncs for the writes
+    performed within this module. Connection settings and the database
+    journal mode are restored where possible before the connection is
+    returned to the pool.
+
+    Parameters
+    ----------
+    engine: sqlalchemy.engine.base.Engine
+        existing sqlalchemy engine for the database to modify
+
+    Returns
+    -------
+    Iterator[sqlite3.Connection]
+        A sqlite3 connection for use within a with statement
+    """
+
+    if not _is_memory_database(engine.url):
+        # release pooled connections to the database which would
+        # otherwise prevent restoring the journal mode below
+        # (in-memory databases only exist through their connection)
+        engine.dispose()
+
+    raw = engine.raw_connection()
+    connection = raw.connection
+    isolation_level = connection.isolation_level
+
+    # pragmas which were applied below, along with their previous values so
+    # they may be restored, as the connection is shared through the pool and
+    # the journal mode persists for the database
+    restore_pragmas: List[str] = []
+
+    try:
+        connection.isolation_level = None
+        for pragma in SQLITE_WRITE_PRAGMAS:
+            name = pragma.split("=", maxsplit=1)[0]
+            value = connection.execute(f"{name};").fetchone()[0]
+            connection.execute(pragma)
+            restore_pragmas.append(f"{name}={value};")
+
+    except sqlite3.Error:
+        _restore_connection(connection, isolation_level, restore_pragmas)
+        if not _is_memory_database(engine.url):
+            # discard the connection instead of returning it to the pool with
+            # settings which may not have been restored (in-memory databases
+            # only exist through their connection and are kept)
+            raw.invalidate()
+        raw.close()
+        raise
+
+    try:
+        yield connection
+    finally:
+        _restore_connection(connection, isolation_level, restore_pragmas)
+        # return the connection to the engine's pool
+        raw.close()
+
+
+def _restore_connection(
+    connection: sqlite3.Connection,
+    isolation_level: Any,
+    restore_pragmas: List[str],
+) -> None:
+    """
+    Restore settings changed on a connection by _write_connection.
+
+    Parameters
+    ----------
+    connection: sqlite3.Connection
+        the connection to restore
+    isolation_level: str
+        the isolation level of the connection before it was changed
+    restore_pragmas: List[str]
+        pragma statements which restore the previous pragma values
+
+    Returns
+    -------
+    None
+    """
+
+    for pragma in restore_pragmas:
+        try:
+            connection.execute(pragma)
+        except sqlite3.OperationalError as err:
+            # other connections to the database may prevent leaving WAL mode
+            logger.warning("Unable to restore %s: %s", pragma, err)
+    connection.isolation_level = isolation_level
+
+
+def _work_engine(
+    engine: Engine, dest_path: Optional[str] = None, inplace: bool = True
 ) -> Engine:
     """
-    Update SQLite database columns to nullable where appropriate.
-    Use a backup database to avoid data corruption issues and
-    roughly follow 9-step procedure outlined by SQLite docs here:
-    https://www.sqlite.org/lang_altertable.html#making_other_kinds_of_table_schema_changes
+    Gather an engine for the database which fixes should be applied to,
+    copying the database to the destination first when not inplace.
 
     Special notes:
-    - We take advantage of Python >= 3.7 sqlite3 api backup capabilities
-    to keep to a standard implementation for backup portion of this work.
+    - The copy is made through the source engine's existing connection
+    using a single VACUUM INTO statement, replacing any existing
+    database at the destination.
 
     Parameters
     ----------
-    sql_engine: str | sqlalchemy.engine.base.Engine
-        filename of the SQLite database or existing sqlalchemy engine
+    engine: sqlalchemy.engine.base.Engine
+        existing sqlalchemy engine for the source database
     dest_path: str
-        the destination of the updated database with nullable columns, by default None
-    table_name: str
-        optional specific table name to update within database, by default None
+        the destination of the updated database, by default None
     inplace: bool
         whether to replace the source sql database, by default True
 
     Returns
     -------
     sqlalchemy.engine.base.Engine
-        A SQLAlchemy engine for the changed database
+        A SQLAlchemy engine for the database to modify
+
+    Raises
+    ------
+    ValueError
+        When not inplace, no dest_path is provided and the source
+        database is in-memory (there is no filepath to derive one from).
+        Or when not inplace and the dest_path refers to the source database.
     """
 
-    logger.info("Updating database columns to nullable for provided database.")
-
-    # setup a source database connection
-    if isinstance(sql_engine, Engine):
-        # gather sqlalchemy engine url replacing incompatible strings
-        src_sql_url = str(sql_engine.url).replace("sqlite:///", "")
-    else:
-        src_sql_url = sql_engine
-
-    source_engine = sqlite3.connect(src_sql_url)
+    if inplace:
+        # work directly on the source database
+        return engine
 
     # add a default destination path which is separate from our source
     if dest_path is None:
-        dest_path = f"{src_sql_url}_column_update"
+        if _is_memory_database(engine.url):
+            raise ValueError("A dest_path is required to copy an in-memory database.")
+        dest_path = f"{engine.url.database}_column_update"
+
+    dest_engine = engine_from_str(dest_path)
+    dest_file = dest_engine.url.database
+
+    # the destination is removed below, so it must not be the source database
+    # (including through a different relative path or a link to the file)
+    if (
+        not _is_memory_database(engine.url)
+        and os.path.exists(dest_file)
+        and os.path.samefile(engine.url.database, dest_file)
+    ):
+        raise ValueError(
+            "The dest_path refers to the source database, use inplace instead."
+        )
 
-    # setup a destination database connection
-    dest_engine = sqlite3.connect(dest_path)
+    # VACUUM INTO requires that the destination does not already exist
+    if os.path.exists(dest_file):
+        # release any pooled connections to the file we're replacing
+        dest_engine.dispose()
+        os.remove(dest_file)
 
-    # create backup of database using sqlite3 api
-    source_engine.backup(dest_engine)
+    # create a copy of database to work on
+    with _raw_connection(engine) as connection:
+        connection.execute("VACUUM INTO ?;", (dest_file,))
 
-    # gather schema_version for later update
-    schema_version = dest_engine.execute("PRAGMA schema_version;").fetchall()[0][0]
+    # keep the destination engine cached for the new file
+    _refresh_file_identity(dest_engine)
 
-    # gather existing table(s) sql later update
-    sql_stmt = "SELECT name, sql FROM sqlite_master WHERE type = 'table'"
-    if table_name is not None:
-        # if we have a table name provided, target only that table for the modifications
-        sql_stmt += " and UPPER(name) = UPPER(:table_name)"
+    return dest_engine
 
-    table_sql_fetch = dest_engine.execute(
-        sql_stmt, {"table_name": table_name}
-    ).fetchall()
 
-    # prepare table sql with removed not null columns
+def _remove_not_null_constraints(
+    cursor: sqlite3.Cursor, table_names: Optional[Iterable[str]] = None
+) -> None:
+    """
+    Remove NOT NULL column constraints from table(s) by modifying the
+    sqlite_master table sql, roughly following the procedure outlined by
+    SQLite docs here:
+    https://www.sqlite.org/lang_altertable.html#making_other_kinds_of_table_schema_changes
+
+    Special notes:
+    - The cursor is expected to be within an open transaction which the
+    caller is responsible for committing or rolling back.
+
+    Parameters
+    ----------
+    cursor: sqlite3.Cursor
+        cursor for the database to modify
+    table_names: Iterable[str]
+        optional specific table names to update within database, by default None
+
+    Returns
+    -------
+    None
+    """
+
+    # gather schema_version for later update
+    schema_version = cursor.execute("PRAGMA schema_version;").fetchone()[0]
+
+    # gather existing table(s) sql later update, skipping tables without
+    # NOT NULL constraints. LIKE is case-insensitive and the wildcard between
+    # NOT and NULL allows for whitespace variants accepted by SQLite.
+    sql_stmt = (
+        "SELECT name, sql FROM sqlite_master"
+        " WHERE type = 'table' AND sql LIKE '%NOT%NULL%'"
+    )
+    params: Tuple[str, ...] = ()
+    if table_names is not None:
+        # if we have table names provided, target only those tables for the modifications
+        # note: names are uppercased within SQL on both sides of the comparison,
+        # as SQLite's UPPER only affects ASCII characters unlike str.upper
+        params = tuple(table_names)
+        sql_stmt += f" and UPPER(name) IN ({','.join(['UPPER(?)'] * len(params))})"
+
+    table_sql_fetch = cursor.execute(sql_stmt, params).fetchall()
+
+    # prepare table sql with removed not null columns, keeping only those
+    # tables which were changed (LIKE above may match for ex. NOT NULLABLE)
     table_sql_mod = {
-        table[0]: table[1].replace("NOT NULL", "") for table in table_sql_fetch
+        name: modified_sql
+        for name, sql, modified_sql in (
+            (name, sql, _remove_not_null(sql)) for name, sql in table_sql_fetch
+        )
+        if modified_sql != sql
     }
 
-    if len(table_sql_mod) > 0:
-        # check that we have sql to modify
+    if len(table_sql_mod) == 0:
+        # no sql to modify
+        return
+
+    # the schema edit is performed under a savepoint so that failures are
+    # rolled back cleanly, including when nested within a caller's transaction
+    cursor.execute("SAVEPOINT sqlite_clean_fix;")
+
+    try:
+        # enable schema writes
+        cursor.execute("PRAGMA writable_schema=ON")
+
+        # Prepare update statement which will perform the table sql update.
+        # Here we use table sqlite_master as a reference instead of sqlite_schema
+        # to avoid possible issues with os/image sqlite version differences.
+        # See the following for more information:
+        # https://sqlite.org/schematab.html#alternative_names
+        sql_stmt = """
+        UPDATE sqlite_master SET sql = :modified_sql
+        WHERE type = 'table' AND UPPER(name) = UPPER(:table_name);
+        """
+        cursor.executemany(
+            sql_stmt,
+            [
+                {"table_name": name, "modified_sql": modified_sql}
+                for name, modified_sql in table_sql_mod.items()
+            ],
+        )
+        # increment the schema version to track the change
+        cursor.execute(f"PRAGMA schema_version={schema_version+1};")
+
+        # disable schema writes
+        cursor.execute("PRAGMA writable_schema=OFF")
+
+        # check the integrity of the database as advised by SQLite docs.
+        # note: quick_check skips index verification which is not affected by
+        # schema sql changes and is considerably faster for large databases.
+        if cursor.execute("PRAGMA quick_check").fetchone()[0] != "ok":
+            raise sqlite3.IntegrityError(
+                "Detected integrity issue within database after modifications."
+            )
 
-        # disallow autocommit and create cursor for transaction
-        dest_engine.isolation_level = None
-        cursor = dest_engine.cursor()
-        try:
-            # begin transaction
-            cursor.execute("begin")
-
-            # enable schema writes
-            cursor.execute("PRAGMA writable_schema=ON")
-
-            # Prepare update statement which will perform the table sql update.
-            # Here we use table sqlite_master as a reference instead of sqlite_schema
-            # to avoid possible issues with os/image sqlite version differences.
-            # See the following for more information:
-            # https://sqlite.org/schematab.html#alternative_names
-            sql_stmt = """
-            UPDATE sqlite_master SET sql = :modified_sql
-            WHERE type = 'table' AND UPPER(name) = UPPER(:table_name);
-            """
-            for name, modified_sql in table_sql_mod.items():
-                cursor.execute(
-                    sql_stmt, {"table_name": name, "modified_sql": modified_sql}
-                )
-            # increment the schema version to track the change
-            cursor.execute(f"PRAGMA schema_version={schema_version+1};")
+    except sqlite3.Error:
+        # undo the schema edit, leaving the savepoint for release below
+        cursor.execute("PRAGMA writable_schema=OFF")
+        cursor.execute("ROLLBACK TO SAVEPOINT sqlite_clean_fix;")
+        raise
 
-            # disable schema writes
-            cursor.execute("PRAGMA writable_schema=OFF")
+    finally:
+        cursor.execute("RELEASE SAVEPOINT sqlite_clean_fix;")
 
-            # check the integrity of the database as advised by SQLite docs
-            if cursor.execute("PRAGMA integrity_check").fetchall()[0][0] != "ok":
-                raise sqlite3.IntegrityError(
-                    "Detected integrity issue within database after modifications."
-                )
 
-            # commit the changes
-            cursor.execute("commit;")
+def update_columns_to_nullable(
+    sql_engine: Union[str, Engine],
+    dest_path: Optional[str] = None,
+    table_name: Optional[str] = None,
+    inplace: bool = True,
+) -> Engine:
+    """
+    Update SQLite database columns to nullable where appropriate.
+    Changes are made within a single transaction which is rolled back
+    on failure, roughly following the procedure outlined by SQLite docs here:
+    https://www.sqlite.org/lang_altertable.html#making_other_kinds_of_table_schema_changes
 
-        except sqlite3.Error as err:
-            logger.error(err)
-            cursor.execute("rollback;")
+    Special notes:
+    - When not inplace, a copy of the database is first made to the
+    destination using SQLite's VACUUM INTO and the changes are made there.
 
-    if inplace:
-        # backup our destination into the source engine, overwriting our original
-        dest_engine.backup(source_engine)
+    Parameters
+    ----------
+    sql_engine: str | sqlalchemy.engine.base.Engine
+        filename of the SQLite database or existing sqlalchemy engine
+    dest_path: str
+        the destination of the updated database with nullable columns, by default None
+    table_name: str
+        optional specific table name to update within database, by default None
+    inplace: bool
+        whether to replace the source sql database, by default True
+
+    Returns
+    -------
+    sqlalchemy.engine.base.Engine
+        A SQLAlchemy engine for the changed database
+    """
 
-    # close our connections
-    source_engine.close()
-    dest_engine.close()
+    logger.info("Updating database columns to nullable for provided database.")
 
-    if inplace:
-        # remove working backup
-        os.remove(dest_path.replace("sqlite:///", ""))
+    work_engine = _work_engine(engine_from_str(sql_engine), dest_path, inplace)
 
-        # return source database
-        return engine_from_str(src_sql_url)
+    # open a connection tuned for writes and create cursor for the changes.
+    # note: the changes are committed on release of the savepoint used within
+    # _remove_not_null_constraints, or rolled back in the event of errors.
+    with _write_connection(work_engine) as connection:
+        cursor = connection.cursor()
+        try:
+            _remove_not_null_constraints(
+                cursor, [table_name] if table_name is not None else None
+            )
 
-    # return copied and modified destination database
-    return engine_from_str(dest_path)
+        except sqlite3.Error as err:
+            logger.error(err)
+
+    # return source database or copied and modified destination database
+    return work_engine
 
 
 def update_values_like_null_to_null(
@@ -185,41 +442,218 @@ def update_values_like_null_to_null(
     # gather columns to be used below
     columns = collect_columns(engine, table_name, column_name)
 
-    # strings which are like nulls for later use in below SQL 'in'
-    like_nulls_str_list = ",".join([f"'{x}'" for x in like_nulls])
+    # strings which are like nulls and their placeholders for below SQL 'in'
+    params = _like_null_params(like_nulls)
+    like_nulls_params = ",".join("?" * len(params))
 
     with engine.begin() as connection:
         for col in columns:
-            # sql to update nan strings to sqlite nulls
+            # sql to update nan strings to sqlite nulls.
+            # note: the collation is applied to the column (left-hand) operand
+            # so that the comparison is made case-insensitively.
             connection.execute(
                 f"""
-                UPDATE {col["table_name"]} SET {col["column_name"]}=NULL
-                WHERE LOWER({col["column_name"]}) IN ({like_nulls_str_list})
-                AND EXISTS(SELECT 1 FROM {col["table_name"]}
-                    WHERE LOWER({col["column_name"]}) IN ({like_nulls_str_list})
-                )
-                """
+                UPDATE {_quote_identifier(col["table_name"])}
+                SET {_quote_identifier(col["column_name"])}=NULL
+                WHERE {_quote_identifier(col["column_name"])} COLLATE NOCASE
+                IN ({like_nulls_params})
+                """,
+                params,
             )  # nosec
 
     return engine
 
 
+def _set_like_nulls_to_null(
+    cursor: sqlite3.Cursor,
+    columns: Iterable[Tuple[str, str]],
+    like_nulls: Tuple[str, ...] = LIKE_NULLS,
+) -> None:
+    """
+    Update text values which are like nulls to NULL for the given columns.
+
+    Special notes:
+    - The cursor is expected to be within an open transaction which the
+    caller is responsible for committing or rolling back.
+
+    Parameters
+    ----------
+    cursor: sqlite3.Cursor
+        cursor for the database to modify
+    columns: Iterable[Tuple[str, str]]
+        pairs of table name and column name to update
+    like_nulls: List[str]
+        tuple strings which may represent null values
+
+    Returns
+    -------
+    None
+    """
+
+    for table, column in columns:
+        predicate, params = _like_null_predicate(column, like_nulls)
+        cursor.execute(
+            f"""
+            UPDATE {_quote_identifier(table)}
+            SET {_quote_identifier(column)}=NULL
+            WHERE {predicate};
+            """,
+            params,
+        )  # nosec
+
+
+def _scan_db(
+    connection: sqlite3.Connection,
+    table_name: Optional[str] = None,
+    column_name: Optional[str] = None,
+    like_nulls: Tuple[str, ...] = LIKE_NULLS,
+) -> Dict[Tuple[str, str], Dict[str, bool]]:
+    """
+    Scan the database for column nullability and whether the column
+    contains strings like nulls using a single query per table (or batch
+    of columns), or a probe of materialized indexes where they exist.
+
+    Parameters
+    ----------
+    connection: sqlite3.Connection
+        connection to the database used to collect columns and scan values
+    table_name: str
+        optional specific table name to check within database, by default None
+    column_name: str
+        optional specific column name to check within database, by default None
+    like_nulls: List[str]
+        tuple strings which may represent null values
+
+    Returns
+    -------
+    Dict[Tuple[str, str], Dict[str, bool]]
+        Dictionary keyed by (table name, column name) with values similar
+        to the following: {"notnull": bool, "has_like_null": bool}
+    """
+
+    scan: Dict[Tuple[str, str], Dict[str, bool]] = {}
+
+    # like nulls are used as a key for cached sql builders,
+    # so they are made hashable (for ex. when provided as a list)
+    like_nulls = tuple(like_nulls)
+
+    # partial indexes of strings like nulls persisted through linting
+    # (see sqlite_clean.lint.contains_str_like_null) are probed instead
+    # of scanning their columns
+    indexes = _like_null_indexes(connection)
+
+    # note: columns are collected through the connection as it may have a
+    # transaction in progress which other pooled connections could reset.
+    for table, table_columns in _group_columns_by_table(
+        _connection_columns(connection, table_name, column_name)
+    ):
+        scan_columns = table_columns
+
+        # note: index names are only built for each column where persisted
+        # indexes exist, avoiding the overhead for wide tables otherwise
+        if indexes:
+            scan_columns = []
+            for col in table_columns:
+                index, _, probe_sql = _build_like_null_index_sql(
+                    table, col["column_name"], like_nulls
+                )
+                if index not in indexes:
+                    scan_columns.append(col)
+                    continue
+
+                scan[(table, col["column_name"])] = {
+                    # note: 1=True for notnull
+                    "notnull": col["notnull"] == 1,
+                    "has_like_null": bool(
+                        connection.execute(probe_sql).fetchone()[0]  # nosec
+                    ),
+                }
+
+        # the sql below checks each remaining column of the table for strings
+        # like nulls within a single scan of the table.
+        results = _max_of_predicates(
+            connection,
+            table,
+            [
+                _like_null_predicate(col["column_name"], like_nulls)
+                for col in scan_columns
+            ],
+        )
+        for col, found in zip(scan_columns, results):
+            scan[(table, col["column_name"])] = {
+                # note: 1=True for notnull
+                "notnull": col["notnull"] == 1,
+                "has_like_null": bool(found),
+            }
+
+    return scan
+
+
+def _clean_scanned_like_nulls(
+    cursor: sqlite3.Cursor, scan: Dict[Tuple[str, str], Dict[str, bool]]
+) -> None:
+    """
+    Update strings like nulls to NULL for columns found through _scan_db,
+    removing NOT NULL constraints only for tables where not-nullable
+    columns contain strings like nulls.
+
+    Special notes:
+    - The cursor is expected to be within an open transaction which the
+    caller is responsible for committing or rolling back.
+
+    Parameters
+    ----------
+    cursor: sqlite3.Cursor
+        cursor for the database to modify
+    scan: Dict[Tuple[str, str], Dict[str, bool]]
+        results from _scan_db
+
+    Returns
+    -------
+    None
+    """
+
+    # tables which must be updated to allow for null values
+    not_null_tables = {
+        table
+        for (table, _), val in scan.items()
+        if val["has_like_null"] and val["notnull"]
+    }
+
+    if not_null_tables:
+        # perform the schema update
+        _remove_not_null_constraints(cursor, not_null_tables)
+
+    # update the like nulls to actual null
+    _set_like_nulls_to_null(
+        cursor, [key for key, val in scan.items() if val["has_like_null"]]
+    )
+
+
 def clean_like_nulls(
     sql_engine: Union[str, Engine],
     dest_path: Optional[str] = None,
     table_name: Optional[str] = None,
     column_name: Optional[str] = None,
     inplace: bool = True,
+    *,
+    connection: Optional[sqlite3.Connection] = None,
 ) -> Engine:
     """
     Updates column values from 'nan' to NULL, performing necessary
     database schema updates where necessary.
 
+    Special notes:
+    - Schema and value updates are performed within a single transaction.
+    A copy of the database is only made when inplace is False.
+    - When a connection is provided, changes are made using it within
+    the caller's transaction and dest_path and inplace are not used.
+
     Parameters
     ----------
     sql_engine: str | sqlalchemy.engine.base.Engine
         filename of the SQLite database or existing sqlalchemy engine
-        dest_path: str
+    dest_path: str
         the destination of the updated database with nullable columns, by default None
     table_name: str
         optional specific table name to check within database, by default None
@@ -227,13 +661,24 @@ def clean_like_nulls(
         optional specific column name to check within database, by default None
     inplace: bool
         whether to replace the source sql database, by default True
+    connection: sqlite3.Connection
+        optional open connection to the database with a transaction
+        in progress to make changes with, by default None
 
     Returns
     -------
     sqlalchemy.engine.base.Engine
         A SQLAlchemy engine for the database
+
+    Raises
+    ------
+    sqlite3.Error
+        When the changes fail (for ex. a NULL value violates a CHECK
+        constraint), after the changes have been rolled back.
     """
 
+    # pylint: disable=too-many-arguments
+
     logger.info(
         (
             "Updating column values with str 'nan' to NULL values, "
@@ -241,24 +686,132 @@ def clean_like_nulls(
         )
     )
 
-    # if we detect that there are strings like nulls in the database
-    if contains_str_like_null(sql_engine, table_name, column_name):
-
-        # if we have at least one not-nullable column we must update the database
-        # to allow for null values in those columns. Note: 1=True for notnull.
-        if 1 in [
-            col["notnull"]
-            for col in collect_columns(sql_engine, table_name, column_name)
-        ]:
-            # perform the schema update
-            sql_engine = update_columns_to_nullable(
-                sql_engine, dest_path, table_name, inplace
-            )
+    # create an engine
+    engine = engine_from_str(sql_engine)
 
-        # update the like nulls to actual null
-        sql_engine = update_values_like_null_to_null(
-            sql_engine, table_name, column_name
+    if connection is not None:
+        # make changes within the caller's transaction
+        _clean_scanned_like_nulls(
+            connection.cursor(),
+            _scan_db(connection, table_name, column_name),
         )
+        return engine
+
+    # gather column nullability and strings like nulls in one pass
+    with _raw_connection(engine) as read_connection:
+        scan = _scan_db(read_connection, table_name, column_name)
+
+    # if we detect that there are no strings like nulls in the database
+    # the engine is passed back as-is.
+    if not any(val["has_like_null"] for val in scan.values()):
+        return engine
+
+    work_engine = _work_engine(engine, dest_path, inplace)
+
+    # open a connection tuned for writes and create cursor for a single transaction
+    with _write_connection(work_engine) as write_connection:
+        cursor = write_connection.cursor()
+        try:
+            # begin transaction, reserving the database for writes
+            cursor.execute("BEGIN IMMEDIATE;")
+
+            _clean_scanned_like_nulls(cursor, scan)
+
+            # commit the changes
+            cursor.execute("COMMIT;")
+
+        except sqlite3.Error:
+            # undo all changes before surfacing the error to the caller
+            cursor.execute("ROLLBACK;")
+            raise
+
+    # return source database or copied and modified destination database
+    return work_engine
+
+
+def apply_fixes(
+    sql_engine: Union[str, Engine],
+    fix_rules: List[Dict[str, Any]],
+    dest_path: Optional[str] = None,
+    *,
+    table_name: Optional[str] = None,
+    column_name: Optional[str] = None,
+    inplace: bool = True,
+    strict: bool = False,
+) -> Engine:
+    """
+    Apply fixes to the database using a single connection and transaction
+    which is shared by each of the fixes.
+
+    Parameters
+    ----------
+    sql_engine: str | sqlalchemy.engine.base.Engine
+        filename of the SQLite database or existing sqlalchemy engine
+    fix_rules: List[Dict[str, Any]]
+        fix rules with a ref to a fix function which accepts a connection,
+        for ex. sqlite_clean.catalog.SQLITE_CLEAN_CATALOG["fix"]
+    dest_path: str
+        the destination of the updated database, by default None
+    table_name: str
+        optional specific table name to fix within database, by default None
+    column_name: str
+        optional specific column name to fix within database, by default None
+    inplace: bool
+        whether to replace the source sql database, by default True
+    strict: bool
+        whether to run a full PRAGMA integrity_check, which verifies
+        every page and index of the database, before committing the
+        fixes, by default False
+
+    Returns
+    -------
+    sqlalchemy.engine.base.Engine
+        A SQLAlchemy engine for the changed database
+
+    Raises
+    ------
+    sqlite3.Error
+        When any of the fixes fail, after all fixes have been rolled back.
+    """
+
+    # pylint: disable=too-many-arguments
+
+    logger.info("Applying fixes to SQLite database.")
+
+    # create an engine
+    engine = engine_from_str(sql_engine)
+
+    work_engine = _work_engine(engine, dest_path, inplace)
+
+    with _write_connection(work_engine) as connection:
+        try:
+            # begin transaction, reserving the database for writes
+            connection.execute("BEGIN IMMEDIATE;")
+
+            for rule in fix_rules:
+                rule["ref"](
+                    work_engine,
+                    table_name=table_name,
+                    column_name=column_name,
+                    connection=connection,
+                )
+
+            # schema edits are verified using PRAGMA quick_check, the full
+            # check is optional as it scales with the size of the database.
+            if (
+                strict
+                and connection.execute("PRAGMA integrity_check").fetchone()[0] != "ok"
+            ):
+                raise sqlite3.IntegrityError(
+                    "Detected integrity issue within database after modifications."
+                )
+
+            # commit the changes
+            connection.execute("COMMIT;")
+
+        except sqlite3.Error:
+            # undo all fixes before surfacing the error to the caller
+            connection.execute("ROLLBACK;")
+            raise
 
-    # return the sql engine
-    return sql_engine
+    return work_engine
@@ -3,18 +3,366 @@ sqlite-clean linting - Detecting and alerting possible data challenges within SQ
 """
 
 import logging
-from typing import Optional, Tuple, Union
+import sqlite3
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple, Union
 
+from sqlalchemy.engine import Row
 from sqlalchemy.engine.base import Engine
 
-from sqlite_clean.constants import LIKE_NULLS, SQLITE_AFF_REF
-from sqlite_clean.utils import collect_columns, engine_from_str
+from sqlite_clean.constants import AFFINITY_VALID_STORAGE_SQL, LIKE_NULLS
+from sqlite_clean.utils import (
+    _batches,
+    _build_like_null_index_sql,
+    _group_columns_by_table,
+    _like_null_indexes,
+    _like_null_params,
+    _like_null_predicate,
+    _max_of_predicates,
+    _quote_identifier,
+    _raw_connection,
+    collect_columns,
+    engine_from_str,
+)
 
 logger = logging.getLogger(__name__)
 
 # pylint: disable=unused-argument
 
 
+def _column_affinity(column_type: str) -> str:
+    """
+    Determine the SQLite affinity type for a declared column type
+    using the rules described here:
+    https://www.sqlite.org/datatype3.html#determination_of_column_affinity
+
+    Parameters
+    ----------
+    column_type: str
+        the declared column type, for ex. VARCHAR(10)
+
+    Returns
+    -------
+    str
+        The affinity type: INTEGER, TEXT, BLOB, REAL or NUMERIC.
+    """
+
+    column_type = column_type.upper()
+
+    if "INT" in column_type:
+        return "INTEGER"
+    if any(x in column_type for x in ("CHAR", "CLOB", "TEXT")):
+        return "TEXT"
+    if "BLOB" in column_type or column_type == "":
+        return "BLOB"
+    if any(x in column_type for x in ("REAL", "FLOA", "DOUB")):
+        return "REAL"
+    return "NUMERIC"
+
+
+def _affinity_predicate(column_name: str, column_type: str) -> str:
+    """
+    Build a SQL predicate which is true for column values which do not
+    match the column affinity type (for ex. a string in an integer column).
+
+    Parameters
+    ----------
+    column_name: str
+        the column name to build the predicate for
+    column_type: str
+        the declared column type
+
+    Returns
+    -------
+    str
+        A SQL predicate for use within a WHERE clause or select list.
+    """
+
+    return (
+        f"TYPEOF({_quote_identifier(column_name)}) NOT IN "
+        f"{AFFINITY_VALID_STORAGE_SQL[_column_affinity(column_type)]}"
+    )
+
+
+def _first_match_sql(table: str, predicates: List[str]) -> str:
+    """
+    Build SQL which returns the first row of a table matching any of
+    the predicates, selecting each predicate's result for that row.
+
+    Parameters
+    ----------
+    table: str
+        the table name to check
+    predicates: List[str]
+        SQL predicates to check
+
+    Returns
+    -------
+    str
+        SQL for use with a single scan of the table.
+    """
+
+    return (
+        f"SELECT {', '.join(predicates)}"
+        f" FROM {_quote_identifier(table)}"
+        f" WHERE {' OR '.join(predicates)}"
+        " LIMIT 1;"
+    )
+
+
+@lru_cache(maxsize=64)
+def _build_conflict_sql(
+    table: str, columns: Tuple[str, ...], column_types: Tuple[str, ...]
+) -> str:
+    """
+    Build and cache SQL detecting conflicting affinity vs storage
+    class values for the given table columns.
+
+    Parameters
+    ----------
+    table: str
+        the table name to check
+    columns: Tuple[str, ...]
+        column names within the table to check
+    column_types: Tuple[str, ...]
+        declared column types for each of the columns
+
+    Returns
+    -------
+    str
+        SQL as per _first_match_sql.
+    """
+
+    return _first_match_sql(
+        table,
+        [
+            _affinity_predicate(column, column_type)
+            for column, column_type in zip(columns, column_types)
+        ],
+    )
+
+
+@lru_cache(maxsize=64)
+def _build_like_null_sql(
+    table: str, columns: Tuple[str, ...], like_nulls: Tuple[str, ...]
+) -> str:
+    """
+    Build and cache SQL detecting strings like nulls for the given
+    table columns. Parameters to bind are as per _like_null_params,
+    repeated for each column within the select list and where clause.
+
+    Parameters
+    ----------
+    table: str
+        the table name to check
+    columns: Tuple[str, ...]
+        column names within the table to check
+    like_nulls: Tuple[str, ...]
+        tuple strings which may represent null values
+
+    Returns
+    -------
+    str
+        SQL as per _first_match_sql.
+    """
+
+    return _first_match_sql(
+        table, [_like_null_predicate(column, like_nulls)[0] for column in columns]
+    )
+
+
+def _execute_in_transaction(
+    connection: sqlite3.Connection, statements: List[str]
+) -> None:
+    """
+    Execute statements within a single transaction, which is
+    rolled back on failure.
+
+    Parameters
+    ----------
+    connection: sqlite3.Connection
+        an open connection to the database without a transaction in progress
+    statements: List[str]
+        SQL statements to execute
+
+    Returns
+    -------
+    None
+    """
+
+    if not statements:
+        return
+
+    connection.execute("BEGIN;")
+    try:
+        for statement in statements:
+            connection.execute(statement)  # nosec
+    except sqlite3.Error:
+        connection.execute("ROLLBACK;")
+        raise
+    connection.execute("COMMIT;")
+
+
+def _conflicting_aff_storage_class_predicate(
+    column: Row, like_nulls: Tuple[str, ...] = LIKE_NULLS
+) -> Tuple[str, Tuple[str, ...]]:
+    """
+    Column-level lint predicate detecting values which do not match the
+    column affinity type (for ex. a string in an integer column).
+
+    Parameters
+    ----------
+    column: sqlalchemy.engine.Row
+        a column as returned from sqlite_clean.utils.collect_columns
+    like_nulls: Tuple[str, ...]
+        unused, accepted for consistency with other lint predicates
+
+    Returns
+    -------
+    Tuple[str, Tuple[str, ...]]
+        A SQL predicate along with the parameters to bind for it.
+    """
+
+    return _affinity_predicate(column["column_name"], column["column_type"]), ()
+
+
+def _str_like_null_predicate(
+    column: Row, like_nulls: Tuple[str, ...] = LIKE_NULLS
+) -> Tuple[str, Tuple[str, ...]]:
+    """
+    Column-level lint predicate detecting string values which are like nulls.
+
+    Parameters
+    ----------
+    column: sqlalchemy.engine.Row
+        a column as returned from sqlite_clean.utils.collect_columns
+    like_nulls: Tuple[str, ...]
+        tuple strings which may represent null values
+
+    Returns
+    -------
+    Tuple[str, Tuple[str, ...]]
+        A SQL predicate along with the parameters to bind for it.
+    """
+
+    return _like_null_predicate(column["column_name"], like_nulls)
+
+
+def _lint_table(
+    connection: sqlite3.Connection,
+    table: str,
+    table_columns: list,
+    lint_rules: List[Dict[str, Any]],
+    like_nulls: Tuple[str, ...],
+) -> List[Dict[str, str]]:
+    """
+    Collect all lint issues for a single table using one query
+    (or one query per batch of checks for wide tables).
+
+    Parameters
+    ----------
+    connection: sqlite3.Connection
+        an open connection to the database
+    table: str
+        the table name to check
+    table_columns: list
+        columns of the table as returned from sqlite_clean.utils.collect_columns
+    lint_rules: List[Dict[str, Any]]
+        lint rules with an id, desc and column-level predicate
+    like_nulls: List[str]
+        tuple strings which may represent null values
+
+    Returns
+    -------
+    List[Dict[str, str]]
+        Issues detected as per lint_database.
+    """
+
+    # each lint rule is checked for each column of the table
+    checks = [(rule, col) for col in table_columns for rule in lint_rules]
+
+    # the sql below checks all rules for all columns of the
+    # table within a single scan of the table.
+    results = _max_of_predicates(
+        connection,
+        table,
+        [rule["predicate"](col, like_nulls) for rule, col in checks],
+    )
+
+    issues = []
+    for (rule, col), found in zip(checks, results):
+        # note: MAX of an empty table is NULL
+        if found:
+            logger.warning(
+                "Discovered %s in %s column %s.",
+                rule["id"],
+                table,
+                col["column_name"],
+            )
+            issues.append(
+                {
+                    "id": rule["id"],
+                    "desc": rule["desc"],
+                    "table_name": table,
+                    "column_name": col["column_name"],
+                }
+            )
+
+    return issues
+
+
+def lint_database(
+    sql_engine: Union[str, Engine],
+    lint_rules: List[Dict[str, Any]],
+    table_name: Optional[str] = None,
+    column_name: Optional[str] = None,
+    like_nulls: Tuple[str, ...] = LIKE_NULLS,
+) -> List[Dict[str, str]]:
+    """
+    Collect all lint issues for the entire SQLite database, a specific
+    table, or a specific column within a specific table. All lint rules
+    are checked together using a single query per table (or per batch
+    of columns for wide tables).
+
+    Parameters
+    ----------
+    sql_engine: str | sqlalchemy.engine.base.Engine
+        filename of the SQLite database or existing sqlalchemy engine
+    lint_rules: List[Dict[str, Any]]
+        lint rules with an id, desc and column-level predicate, for ex.
+        sqlite_clean.catalog.SQLITE_CLEAN_CATALOG["lint"]
+    table_name: str
+        optional specific table name to check within database, by default None
+    column_name: str
+        optional specific column name to check within database, by default None
+    like_nulls: List[str]
+        tuple strings which may represent null values, by default LIKE_NULLS global
+
+    Returns
+    -------
+    List[Dict[str, str]]
+        Issues detected, each similar to the following:
+        {"id": ..., "desc": ..., "table_name": ..., "column_name": ...}
+    """
+
+    logger.info("Collecting lint issues for SQLite database.")
+
+    # create an engine
+    engine = engine_from_str(sql_engine)
+
+    issues: List[Dict[str, str]] = []
+
+    with _raw_connection(engine) as connection:
+        for table, table_columns in _group_columns_by_table(
+            collect_columns(engine, table_name, column_name)
+        ):
+            issues += _lint_table(
+                connection, table, table_columns, lint_rules, like_nulls
+            )
+
+    return issues
+
+
 def contains_conflicting_aff_storage_class(
     *args,
     sql_engine: Union[str, Engine],
@@ -61,39 +409,35 @@ def contains_conflicting_aff_storage_class(
     # [('table_name', 'column_name', 'column_type', 'notnull'),...]
     columns = collect_columns(engine, table_name, column_name)
 
-    with engine.connect() as connection:
-        for col in columns:
+    with _raw_connection(engine) as connection:
+        for table, table_columns in _group_columns_by_table(columns):
+            for batch in _batches(table_columns):
 
-            # join formatted string for use with sql query in {col_types} var
-            col_types = ",".join(
-                [f"'{x.lower()}'" for x in SQLITE_AFF_REF[col["column_type"]]]
-            )
-
-            # there are challenges with using sqlalchemy vars in the same manner as above
-            # so we use an f-string here along with nosec
-            result = connection.execute(
-                # the sql below seeks to efficiently detect existence of values which
-                # do not match the column affinity type (for ex. a string in an integer column).
-                f"""
-                SELECT
-                EXISTS(
-                    SELECT 1 FROM {col["table_name"]}
-                    WHERE TYPEOF({col["column_name"]}) NOT IN ({col_types})
-                )
-                AS 'CONFLICTING_TYPES_EXIST';
-                """
-            ).fetchone()[
-                "CONFLICTING_TYPES_EXIST"
-            ]  # nosec
-            if result > 0:
-                # if our result is greater than 0 it means values with conflicting storage
-                # class existed within the focus column and as a result, we return False
-                logger.warning(
-                    "Discovered conflicting %s column %s affinity type and storage class.",
-                    col["table_name"],
-                    col["column_name"],
-                )
-                return True
+                # there are challenges with using sqlalchemy vars for identifiers
+                # so we use f-string built sql here along with nosec.
+                # the sql below checks all columns of the batch within a single scan,
+                # returning the first row which contains any conflict (or no row at all).
+                result = connection.execute(
+                    _build_conflict_sql(
+                        table,
+                        tuple(col["column_name"] for col in batch),
+                        tuple(col["column_type"] for col in batch),
+                    )
+                ).fetchone()  # nosec
+                if result is not None:
+                    # if we received a row it means values with conflicting storage
+                    # class existed within the focus table and as a result, we return True
+                    for col, found in zip(batch, result):
+                        if found:
+                            logger.warning(
+                                (
+                                    "Discovered conflicting %s column %s"
+                                    " affinity type and storage class."
+                                ),
+                                col["table_name"],
+                                col["column_name"],
+                            )
+                    return True
 
     # return false if we did not find conflicting affinity vs storage class values
     logger.info(
@@ -108,6 +452,9 @@ def contains_str_like_null(
     table_name: Optional[str] = None,
     column_name: Optional[str] = None,
     like_nulls: Tuple[str, ...] = LIKE_NULLS,
+    materialize: bool = False,
+    *,
+    persist: bool = False,
 ) -> bool:
     """
     Detect whether the given database, table, or column contains
@@ -115,6 +462,15 @@ def contains_str_like_null(
     SQLite NULL may be interpreted at read as a string (value)
     instead of a NULL (non-value).
 
+    Special notes:
+    - When materialize is True, a partial index of strings like nulls
+    is created for each column (if it does not already exist) and
+    detection probes these indexes. Indexes created by the call are
+    dropped afterwards unless persist is True. Persisted indexes avoid
+    scanning the tables when linting the same database repeatedly and
+    are also probed when fixing the database (see sqlite_clean.fix).
+    Indexes are named with the LIKE_NULL_INDEX_PREFIX.
+
     Parameters
     ----------
     sql_engine: str | sqlalchemy.engine.base.Engine
@@ -125,6 +481,12 @@ def contains_str_like_null(
         optional specific column name to check within database, by default None
     like_nulls: List[str]
         tuple strings which may represent null values, by default LIKE_NULLS global
+    materialize: bool
+        whether to create and use partial indexes of strings like nulls,
+        by default False
+    persist: bool
+        whether to keep partial indexes created through materialize
+        within the database, by default False
 
     Returns
     -------
@@ -132,6 +494,8 @@ def contains_str_like_null(
         Returns True if found a str value similar to null, else returns False.
     """
 
+    # pylint: disable=too-many-arguments,too-many-locals
+
     logger.info(
         "Determining if SQLite database contains table entries with string values like NULL's."
     )
@@ -142,40 +506,105 @@ def contains_str_like_null(
     # gather columns to be used below
     columns = collect_columns(engine, table_name, column_name)
 
-    # strings which are like nulls for later use in below SQL 'in'
-    like_nulls_str_list = ",".join([f"'{x}'" for x in like_nulls])
-
-    with engine.connect() as connection:
-        for col in columns:
-            # the sql below seeks to efficiently detect existence of string
-            # values which are like nulls in columns which contain at least
-            # one string value. Note that we must check the individual value
-            # types instead of the column types due to SQLite's flexible
-            # typing system.
-            result = connection.execute(
-                f"""
-                SELECT
-                (EXISTS(
-                    SELECT 1 FROM {col["table_name"]}
-                    WHERE TYPEOF({col["column_name"]}) = 'text'
-                )
-                AND EXISTS(
-                    SELECT 1 FROM {col["table_name"]}
-                    WHERE LOWER({col["column_name"]}) IN ({like_nulls_str_list})
-                ))
-                AS 'LIKE_NULL_EXISTS';
-                """
-            ).fetchone()[
-                "LIKE_NULL_EXISTS"
-            ]  # nosec
-            if result > 0:
-                # if our result is greater than 0 it means values with str's like null
-                # existed within the focus column and as a result, we return False
-                logger.warning(
-                    "Discovered strings like nulls in %s column %s.",
-                    col["table_name"],
-                    col["column_name"],
-                )
-                return True
+    # like nulls are used as a key for the cached sql builders below,
+    # so they are made hashable (for ex. when provided as a list)
+    like_nulls = tuple(like_nulls)
+
+    if materialize:
+        return _contains_str_like_null_materialized(
+            engine, columns, like_nulls, persist
+        )
+
+    # note: predicates are used within both the select list and the
+    # where clause, so the parameters are bound for each in turn.
+    params = _like_null_params(like_nulls)
+
+    with _raw_connection(engine) as connection:
+        for table, table_columns in _group_columns_by_table(columns):
+            for batch in _batches(table_columns, params_per_item=len(params) * 2):
+                # the sql below seeks to efficiently detect existence of string
+                # values which are like nulls, checking all columns of the batch
+                # within a single scan.
+                result = connection.execute(
+                    _build_like_null_sql(
+                        table,
+                        tuple(col["column_name"] for col in batch),
+                        like_nulls,
+                    ),
+                    params * (len(batch) * 2),
+                ).fetchone()  # nosec
+                if result is not None:
+                    # if we received a row it means values with str's like null
+                    # existed within the focus table and as a result, we return True
+                    for col, found in zip(batch, result):
+                        if found:
+                            logger.warning(
+                                "Discovered strings like nulls in %s column %s.",
+                                col["table_name"],
+                                col["column_name"],
+                            )
+                    return True
 
     return False
+
+
+def _contains_str_like_null_materialized(
+    engine: Engine, columns: list, like_nulls: Tuple[str, ...], persist: bool
+) -> bool:
+    """
+    Detect strings like nulls for the columns using materialized partial
+    indexes as per _build_like_null_index_sql.
+
+    Parameters
+    ----------
+    engine: sqlalchemy.engine.base.Engine
+        existing sqlalchemy engine
+    columns: list
+        columns as returned from sqlite_clean.utils.collect_columns
+    like_nulls: Tuple[str, ...]
+        tuple strings which may represent null values
+    persist: bool
+        whether to keep indexes created here within the database
+
+    Returns
+    -------
+    bool
+        Returns True if found a str value similar to null, else returns False.
+    """
+
+    found = False
+
+    with _raw_connection(engine) as connection:
+        index_sql = [
+            _build_like_null_index_sql(
+                col["table_name"], col["column_name"], like_nulls
+            )
+            for col in columns
+        ]
+
+        # indexes which do not yet exist are created within a single transaction
+        existing = _like_null_indexes(connection)
+        created = {index: create_sql for index, create_sql, _ in index_sql}
+        for index in existing:
+            created.pop(index, None)
+        _execute_in_transaction(connection, list(created.values()))
+
+        try:
+            for col, (_, _, probe_sql) in zip(columns, index_sql):
+                if connection.execute(probe_sql).fetchone()[0]:  # nosec
+                    logger.warning(
+                        "Discovered strings like nulls in %s column %s.",
+                        col["table_name"],
+                        col["column_name"],
+                    )
+                    found = True
+
+        finally:
+            if not persist:
+                # leave the database schema as it was found
+                _execute_in_transaction(
+                    connection,
+                    [f"DROP INDEX {_quote_identifier(index)};" for index in created],
+                )
+
+    return found
@@ -2,19 +2,54 @@
 sqlite-clean utility functions
 """
 
+import hashlib
 import logging
-from typing import Optional, Union
+import os
+import sqlite3
+from contextlib import contextmanager
+from functools import lru_cache
+from itertools import groupby
+from operator import itemgetter
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
 
 from sqlalchemy import create_engine
 from sqlalchemy.engine.base import Engine
+from sqlalchemy.engine.url import URL, make_url
+from sqlalchemy.pool import QueuePool
+
+from sqlite_clean.constants import (
+    LIKE_NULL_INDEX_PREFIX,
+    LIKE_NULLS,
+    LIKE_NULLS_LOWER,
+    SQLITE_MAX_CHECKS_PER_QUERY,
+    SQLITE_MAX_VARIABLE_NUMBER,
+)
 
 logger = logging.getLogger(__name__)
 
+# engines created from str's, keyed by database url so that the same
+# database is not re-opened through a new engine, along with the identity
+# of the database file at the time the engine was created
+_ENGINE_CACHE: Dict[str, Tuple[Engine, Optional[Tuple[int, int]]]] = {}
+
 
 def engine_from_str(sql_engine: Union[str, Engine]) -> Engine:
     """
     Helper function to create engine from a string or return the engine
-    if it's already been created.
+    if it's already been created. Engines created from a string are
+    reused for the same database url (in-memory databases excepted)
+    and pool their connections.
 
     Parameters
     ----------
@@ -32,13 +67,155 @@ def engine_from_str(sql_engine: Union[str, Engine]) -> Engine:
         # if we don't already have the sqlite filestring, add it
         if "sqlite:///" not in sql_engine:
             sql_engine = f"sqlite:///{sql_engine}"
-        engine = create_engine(sql_engine)
+
+        # in-memory databases are distinct per engine, so we avoid reuse
+        if _is_memory_database(make_url(sql_engine)):
+            return create_engine(sql_engine)
+
+        file_identity = _file_identity(make_url(sql_engine).database)
+        cached_engine, cached_identity = _ENGINE_CACHE.get(sql_engine, (None, None))
+
+        if (
+            cached_engine is not None
+            and None not in (cached_identity, file_identity)
+            and cached_identity != file_identity
+        ):
+            # the database file was replaced since the engine was created and
+            # pooled connections would otherwise read from the previous file
+            cached_engine.dispose()
+            cached_engine = None
+
+        if cached_engine is not None and cached_identity is None:
+            # the database file was created since the engine was cached
+            _ENGINE_CACHE[sql_engine] = (cached_engine, file_identity)
+        elif cached_engine is None:
+            # keep a small pool of persistent connections for reuse across
+            # lint and fix operations on the same database
+            cached_engine = create_engine(
+                sql_engine,
+                poolclass=QueuePool,
+                pool_size=4,
+                pool_pre_ping=False,
+                connect_args={"check_same_thread": False},
+            )
+            _ENGINE_CACHE[sql_engine] = (cached_engine, file_identity)
+        engine = cached_engine
     else:
         engine = sql_engine
 
     return engine
 
 
+def _refresh_file_identity(engine: Engine) -> None:
+    """
+    Record the current identity of the database file for an engine
+    created through engine_from_str, for use after the file has been
+    replaced through the engine itself (for ex. by VACUUM INTO).
+
+    Parameters
+    ----------
+    engine: sqlalchemy.engine.base.Engine
+        existing sqlalchemy engine
+
+    Returns
+    -------
+    None
+    """
+
+    key = str(engine.url)
+    if key in _ENGINE_CACHE and _ENGINE_CACHE[key][0] is engine:
+        _ENGINE_CACHE[key] = (engine, _file_identity(engine.url.database))
+
+
+def _file_identity(path: str) -> Optional[Tuple[int, int]]:
+    """
+    Gather the identity of a file (its device and inode) in order to
+    detect when a database file is replaced at the same path.
+
+    Parameters
+    ----------
+    path: str
+        filepath of the SQLite database
+
+    Returns
+    -------
+    Optional[Tuple[int, int]]
+        The device and inode of the file, or None if it does not exist.
+    """
+
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+
+    return stat.st_dev, stat.st_ino
+
+
+def _is_memory_database(url: URL) -> bool:
+    """
+    Determine whether a database url refers to an in-memory SQLite database.
+
+    Parameters
+    ----------
+    url: sqlalchemy.engine.url.URL
+        url of the SQLite database
+
+    Returns
+    -------
+    bool
+        Whether the database is in-memory.
+    """
+
+    return url.database in (None, "", ":memory:")
+
+
+@contextmanager
+def _raw_connection(engine: Engine) -> Iterator[sqlite3.Connection]:
+    """
+    Provide the underlying sqlite3 connection from the engine's pool.
+    Used for small read-only queries where SQLAlchemy statement handling
+    would otherwise outweigh the query itself.
+
+    Parameters
+    ----------
+    engine: sqlalchemy.engine.base.Engine
+        existing sqlalchemy engine
+
+    Returns
+    -------
+    Iterator[sqlite3.Connection]
+        A sqlite3 connection for use within a with statement
+    """
+
+    raw = engine.raw_connection()
+    try:
+        yield raw.connection
+    finally:
+        # return the connection to the engine's pool
+        raw.close()
+
+
+def _quote_identifier(name: str) -> str:
+    """
+    Quote a SQLite identifier (for ex. a table or column name) for use
+    within SQL, as identifiers may not be bound as parameters.
+
+    Parameters
+    ----------
+    name: str
+        the identifier to quote
+
+    Returns
+    -------
+    str
+        The quoted identifier.
+    """
+
+    # double quotes within the identifier are escaped by doubling them
+    escaped = name.replace('"', '""')
+    return f'"{escaped}"'
+
+
 def collect_columns(
     sql_engine: Union[str, Engine],
     table_name: Optional[str] = None,
@@ -67,41 +244,394 @@ def collect_columns(
         [('table_name', 'column_name', 'column_type', 'notnull'),...]
     """
 
-    # create column list for return result
-    column_list = []
-
     # create an engine
     engine = engine_from_str(sql_engine)
 
     with engine.connect() as connection:
-        if table_name is None:
-            # if no table name is provided, we assume all tables must be scanned
-            tables = connection.execute(
-                "SELECT name as table_name FROM sqlite_master WHERE type = 'table';"
-            ).fetchall()
-        else:
-            # otherwise we will focus on just the table name provided
-            tables = [{"table_name": table_name}]
-
-        for table in tables:
-
-            # if no column name is specified we will focus on all columns within the table
-            sql_stmt = """
-            SELECT :table_name as table_name,
-                    name as column_name,
-                    type as column_type,
-                    [notnull]
-            FROM pragma_table_info(:table_name)
-            """
-
-            if column_name is not None:
-                # otherwise we will focus on only the column name provided
-                sql_stmt = f"{sql_stmt} WHERE name = :col_name;"
-
-            # append to column list the results
-            column_list += connection.execute(
-                sql_stmt,
-                {"table_name": str(table["table_name"]), "col_name": str(column_name)},
+        return _collect_columns(connection.execute, table_name, column_name)
+
+
+def _collect_columns(
+    execute: Callable[..., Any],
+    table_name: Optional[str] = None,
+    column_name: Optional[str] = None,
+) -> list:
+    """
+    Implementation of collect_columns which is shared by SQLAlchemy
+    and sqlite3 connections (see _connection_columns).
+
+    Parameters
+    ----------
+    execute: Callable[..., Any]
+        execute method of a connection or cursor which accepts sql
+        and named parameters, returning rows
+    table_name: str
+        optional specific table name to check within database, by default None
+    column_name: str
+        optional specific column name to check within database, by default None
+
+    Returns
+    -------
+    list
+        Columns collected as per collect_columns.
+    """
+
+    # create column list for return result
+    column_list = []
+
+    if table_name is None:
+        # if no table name is provided, we assume all tables must be scanned
+        tables = [
+            row[0]
+            for row in execute(
+                "SELECT name FROM sqlite_master WHERE type = 'table';"
             ).fetchall()
+        ]
+    else:
+        # otherwise we will focus on just the table name provided
+        tables = [table_name]
+
+    for table in tables:
+        # append to column list the results
+        column_list += execute(
+            _columns_sql(column_name),
+            {"table_name": str(table), "col_name": str(column_name)},
+        ).fetchall()
 
     return column_list
+
+
+def _columns_sql(column_name: Optional[str] = None) -> str:
+    """
+    Build SQL which collects the columns of a table (bound as
+    :table_name), optionally for a specific column (bound as :col_name).
+
+    Parameters
+    ----------
+    column_name: str
+        optional specific column name to collect, by default None
+
+    Returns
+    -------
+    str
+        SQL for use with collect_columns.
+    """
+
+    # if no column name is specified we will focus on all columns within the table
+    sql_stmt = """
+    SELECT :table_name as table_name,
+            name as column_name,
+            type as column_type,
+            [notnull]
+    FROM pragma_table_info(:table_name)
+    """
+
+    if column_name is not None:
+        # otherwise we will focus on only the column name provided
+        sql_stmt = f"{sql_stmt} WHERE name = :col_name;"
+
+    return sql_stmt
+
+
+def _connection_columns(
+    connection: sqlite3.Connection,
+    table_name: Optional[str] = None,
+    column_name: Optional[str] = None,
+) -> list:
+    """
+    Collect columns as per collect_columns using an open sqlite3 connection.
+    Used within a transaction in progress on the connection, where checking
+    out a pooled connection may otherwise reset the transaction (for ex.
+    in-memory databases which share a single connection).
+
+    Parameters
+    ----------
+    connection: sqlite3.Connection
+        an open connection to the database
+    table_name: str
+        optional specific table name to check within database, by default None
+    column_name: str
+        optional specific column name to check within database, by default None
+
+    Returns
+    -------
+    list
+        Columns as sqlite3.Row objects which may be accessed by index
+        or by name as per collect_columns.
+    """
+
+    cursor = connection.cursor()
+    cursor.row_factory = sqlite3.Row
+
+    return _collect_columns(cursor.execute, table_name, column_name)
+
+
+def _group_columns_by_table(columns: list) -> Iterator[Tuple[str, List]]:
+    """
+    Group collected columns by their table name so that checks may
+    be performed using a single query per table.
+
+    Parameters
+    ----------
+    columns: list
+        columns as returned from sqlite_clean.utils.collect_columns
+
+    Returns
+    -------
+    Iterator[Tuple[str, List]]
+        Pairs of table name and the list of columns within that table.
+    """
+
+    # note: table_name is accessed by position (the first column of
+    # each row) to avoid name-based lookups for each column.
+    table_key = itemgetter(0)
+
+    for table, table_columns in groupby(sorted(columns, key=table_key), key=table_key):
+        yield table, list(table_columns)
+
+
+def _batches(
+    items: List[Any], params_per_item: int = 0, checks_per_item: int = 1
+) -> Iterator[List[Any]]:
+    """
+    Split items (for ex. the columns of a table) into batches which may
+    each be checked within a single query without exceeding SQLite limits
+    for wide tables. See sqlite_clean.constants.SQLITE_MAX_CHECKS_PER_QUERY.
+
+    Parameters
+    ----------
+    items: List[Any]
+        items to split into batches
+    params_per_item: int
+        the number of parameters bound for each item, by default 0
+    checks_per_item: int
+        the number of checks (predicates) for each item, by default 1
+
+    Returns
+    -------
+    Iterator[List[Any]]
+        Batches of the items, in order.
+    """
+
+    size = SQLITE_MAX_CHECKS_PER_QUERY // max(checks_per_item, 1)
+    if params_per_item > 0:
+        size = min(size, SQLITE_MAX_VARIABLE_NUMBER // params_per_item)
+
+    # note: at least one item is included within each batch
+    size = max(size, 1)
+
+    for start in range(0, len(items), size):
+        yield items[start : start + size]
+
+
+def _like_null_params(like_nulls: Tuple[str, ...]) -> Tuple[str, ...]:
+    """
+    Lowercase and deduplicate strings which are like nulls for binding
+    as parameters.
+
+    Parameters
+    ----------
+    like_nulls: Tuple[str, ...]
+        tuple strings which may represent null values
+
+    Returns
+    -------
+    Tuple[str, ...]
+        Lowercase strings which are like nulls.
+    """
+
+    if like_nulls == LIKE_NULLS:
+        return LIKE_NULLS_LOWER
+
+    # duplicates which differ only by case are removed, keeping order
+    return tuple(dict.fromkeys(x.lower() for x in like_nulls))
+
+
+def _like_null_predicate(
+    column_name: str, like_nulls: Tuple[str, ...]
+) -> Tuple[str, Tuple[str, ...]]:
+    """
+    Build a SQL predicate which is true for column values which are
+    strings like null. Note that we must check the individual value
+    types instead of the column types due to SQLite's flexible
+    typing system.
+
+    Parameters
+    ----------
+    column_name: str
+        the column name to build the predicate for
+    like_nulls: Tuple[str, ...]
+        tuple strings which may represent null values
+
+    Returns
+    -------
+    Tuple[str, Tuple[str, ...]]
+        A SQL predicate for use within a WHERE clause or select list
+        along with the parameters to bind for the predicate.
+    """
+
+    # strings which are like nulls for binding within below SQL 'in'
+    params = _like_null_params(like_nulls)
+
+    column = _quote_identifier(column_name)
+
+    # note: the NOCASE collation compares values without creating a lowered
+    # copy of each value as LOWER() would. The collation must follow the
+    # column (and not the list) in order to apply to the comparison.
+    return (
+        f"(TYPEOF({column}) = 'text'"
+        f" AND {column} COLLATE NOCASE IN ({','.join('?' * len(params))}))"
+    ), params
+
+
+def _combine_predicates(
+    predicates: Iterable[Tuple[str, Tuple[str, ...]]]
+) -> Tuple[List[str], Tuple[str, ...]]:
+    """
+    Combine SQL predicates and their parameters for use within a single
+    query, keeping parameters in the same order as their predicates.
+
+    Parameters
+    ----------
+    predicates: Iterable[Tuple[str, Tuple[str, ...]]]
+        pairs of SQL predicate and the parameters to bind for it
+
+    Returns
+    -------
+    Tuple[List[str], Tuple[str, ...]]
+        A list of the SQL predicates along with the parameters
+        to bind for all predicates in order.
+    """
+
+    sql_predicates = []
+    params: List[str] = []
+    for predicate, predicate_params in predicates:
+        sql_predicates.append(predicate)
+        params.extend(predicate_params)
+
+    return sql_predicates, tuple(params)
+
+
+def _max_of_predicates(
+    connection: sqlite3.Connection,
+    table: str,
+    predicates: List[Tuple[str, Tuple[str, ...]]],
+) -> list:
+    """
+    Check SQL predicates against the rows of a table using a single scan
+    of the table (or one scan per batch of predicates for wide tables).
+
+    Parameters
+    ----------
+    connection: sqlite3.Connection
+        an open connection to the database
+    table: str
+        the table name to check
+    predicates: List[Tuple[str, Tuple[str, ...]]]
+        pairs of SQL predicate and the parameters to bind for it
+
+    Returns
+    -------
+    list
+        The MAX of each predicate, in order. Values are 1 where the predicate
+        was true for any row, else 0 (or None for tables without rows).
+    """
+
+    results: list = []
+
+    # note: batches are bounded using the most parameters of any predicate
+    for batch in _batches(
+        predicates, params_per_item=max((len(x[1]) for x in predicates), default=0)
+    ):
+        sql_predicates, params = _combine_predicates(batch)
+        results += connection.execute(
+            f"SELECT {', '.join(f'MAX({x})' for x in sql_predicates)}"
+            f" FROM {_quote_identifier(table)};",
+            params,
+        ).fetchone()  # nosec
+
+    return results
+
+
+@lru_cache(maxsize=64)
+def _build_like_null_index_sql(
+    table: str, column: str, like_nulls: Tuple[str, ...]
+) -> Tuple[str, str, str]:
+    """
+    Build and cache SQL which materializes a partial index containing
+    only the strings like nulls for a table column, along with SQL which
+    detects strings like nulls using a probe of that index.
+
+    Special notes:
+    - Partial index predicates may not use bound parameters, so the
+    strings like nulls are included as quoted literals.
+    - The index name includes a hash of the quoted table name, column
+    name and strings like nulls, so that names may not collide between
+    different tables and columns (for ex. table a_b column c and table
+    a column b_c) and different like_nulls are indexed separately.
+    - SQLite does not allow STORED generated columns to be added through
+    ALTER TABLE, whereas a partial index offers the same index probe
+    without changes to the table columns.
+
+    Parameters
+    ----------
+    table: str
+        the table name to check
+    column: str
+        the column name within the table to check
+    like_nulls: Tuple[str, ...]
+        tuple strings which may represent null values
+
+    Returns
+    -------
+    Tuple[str, str, str]
+        The index name, SQL which creates the index if it does not exist
+        and SQL which returns 1 if the column contains strings like nulls,
+        else 0.
+    """
+
+    # single quotes within the literals are escaped by doubling them
+    escaped = (x.replace("'", "''") for x in _like_null_params(like_nulls))
+    literals = ",".join(f"'{x}'" for x in escaped)
+    quoted_table = _quote_identifier(table)
+    quoted_column = _quote_identifier(column)
+    predicate = (
+        f"(TYPEOF({quoted_column}) = 'text'"
+        f" AND {quoted_column} COLLATE NOCASE IN ({literals}))"
+    )
+    index_hash = hashlib.sha256(
+        f"{quoted_table}.{quoted_column}:{literals}".encode()
+    ).hexdigest()
+    index = f"{LIKE_NULL_INDEX_PREFIX}{index_hash[:16]}"
+
+    return (
+        index,
+        f"CREATE INDEX IF NOT EXISTS {_quote_identifier(index)}"
+        f" ON {quoted_table} ({quoted_column}) WHERE {predicate};",
+        f"SELECT EXISTS(SELECT 1 FROM {quoted_table} WHERE {predicate});",
+    )
+
+
+def _like_null_indexes(connection: sqlite3.Connection) -> Set[str]:
+    """
+    Gather the names of partial indexes of strings like nulls which
+    have been materialized within the database.
+
+    Parameters
+    ----------
+    connection: sqlite3.Connection
+        an open connection to the database
+
+    Returns
+    -------
+    Set[str]
+        Names of the indexes.
+    """
+
+    return {
+        row[0]
+        for row in connection.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'index' AND name GLOB ?;",
+            (f"{LIKE_NULL_INDEX_PREFIX}*",),
+        ).fetchall()
+    }
@@ -1,26 +1,60 @@
 """
 pytest conftest file for shared fixtures etc.
 """
+import sqlite3
 import tempfile
+from typing import Optional
 
 import pytest
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.engine.base import Engine
+from sqlalchemy.pool import StaticPool
 
+# pragmas which avoid disk syncs for the disposable test database.
+# note: locking_mode=EXCLUSIVE and journal_mode changes are not used as
+# sqlite-clean opens separate connections to the same database file
+# and manages the journal mode itself when applying fixes.
+TEST_PRAGMAS = (
+    "PRAGMA synchronous=OFF;",
+    "PRAGMA temp_store=MEMORY;",
+    "PRAGMA cache_size=-20000;",
+)
 
-@pytest.fixture
-def database_engine_for_testing() -> Engine:
+
+def _apply_test_pragmas(dbapi_connection, connection_record):
     """
-    A database engine for testing as a fixture to be passed
-    to other tests within this file.
+    Apply TEST_PRAGMAS to each new connection made by the test engine.
     """
 
-    # get temporary directory
-    tmpdir = tempfile.gettempdir()
+    # pylint: disable=unused-argument
 
-    # create a temporary sqlite connection
-    sql_path = f"sqlite:///{tmpdir}/test_sqlite.sqlite"
-    engine = create_engine(sql_path)
+    for pragma in TEST_PRAGMAS:
+        dbapi_connection.execute(pragma)
+
+
+def _memory_engine(connection: Optional[sqlite3.Connection] = None) -> Engine:
+    """
+    Create an in-memory database engine which is shared by all
+    connections from the engine through a static pool, avoiding file io.
+    An existing in-memory sqlite3 connection may optionally be used.
+    """
+
+    if connection is not None:
+        return create_engine(
+            "sqlite://", poolclass=StaticPool, creator=lambda: connection
+        )
+
+    return create_engine(
+        "sqlite://",
+        poolclass=StaticPool,
+        connect_args={"check_same_thread": False},
+    )
+
+
+def _create_test_database(engine: Engine) -> Engine:
+    """
+    Create the simple test database structure and values using the engine.
+    """
 
     # statements for creating database with simple structure
     create_stmts = [
@@ -48,7 +82,7 @@ def database_engine_for_testing() -> Engine:
 
     with engine.begin() as connection:
         for stmt in create_stmts:
-            connection.execute(stmt)
+            connection.exec_driver_sql(stmt)
 
         # insert statement with some simple values
         # note: we use SQLAlchemy's parameters to insert data properly, esp. BLOB
@@ -68,3 +102,69 @@ def database_engine_for_testing() -> Engine:
         )
 
     return engine
+
+
+@pytest.fixture(name="database_template_for_testing", scope="session")
+def fixture_database_template_for_testing() -> sqlite3.Connection:
+    """
+    A sqlite3 connection to an in-memory test database which is created
+    once per session and copied for each test (and not changed itself).
+    """
+
+    template_engine = _create_test_database(_memory_engine())
+
+    # note: the raw connection remains open through the static pool
+    return template_engine.raw_connection().connection
+
+
+@pytest.fixture
+def database_engine_for_testing(database_template_for_testing) -> Engine:
+    """
+    A database engine for testing as a fixture to be passed
+    to other tests within this file.
+    """
+
+    # copy the template database pages into a new in-memory database,
+    # which resets state for each test without re-running table creation
+    connection = sqlite3.connect(":memory:", check_same_thread=False)
+    database_template_for_testing.backup(connection)
+
+    return _memory_engine(connection)
+
+
+@pytest.fixture(scope="module")
+def database_engine_with_like_nulls() -> Engine:
+    """
+    A database engine for testing with strs like nulls in each column
+    of tbl_a, created once per module for read-only tests.
+    """
+
+    engine = _create_test_database(_memory_engine())
+
+    with engine.begin() as connection:
+        connection.exec_driver_sql(
+            """
+            INSERT INTO tbl_a (col_integer, col_text, col_blob, col_real)
+            VALUES ('NaN', 'NULL', 'nan', 'None');
+            """
+        )
+
+    return engine
+
+
+@pytest.fixture
+def database_file_engine_for_testing() -> Engine:
+    """
+    A file-based database engine for testing as a fixture to be
+    passed to tests which require a database filepath (for ex. the cli).
+    """
+
+    # get temporary directory
+    tmpdir = tempfile.gettempdir()
+
+    # create a temporary sqlite connection
+    sql_path = f"sqlite:///{tmpdir}/test_sqlite.sqlite"
+    engine = create_engine(sql_path)
+    event.listen(engine, "connect", _apply_test_pragmas)
+
+    return _create_test_database(engine)
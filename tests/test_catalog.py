@@ -1,5 +1,7 @@
 """ Tests for sqlite_clean.catalog """
 
+from itertools import chain
+
 import jsonschema
 
 from sqlite_clean.catalog import SQLITE_CLEAN_CATALOG
@@ -17,8 +19,9 @@ SQLITE_CLEAN_CATALOG_SCHEMA = {
                     "id": {"type": "string"},
                     "desc": {"type": "string"},
                     "ref": {"type": "string"},
+                    "predicate": {"type": "string"},
                 },
-                "required": ["desc", "id", "ref"],
+                "required": ["desc", "id", "ref", "predicate"],
             },
         },
         "fix": {
@@ -37,34 +40,40 @@ SQLITE_CLEAN_CATALOG_SCHEMA = {
     "required": ["fix", "lint"],
 }
 
+# validator compiled once for reuse within tests below
+SQLITE_CLEAN_CATALOG_VALIDATOR = jsonschema.Draft7Validator(SQLITE_CLEAN_CATALOG_SCHEMA)
+
+
+def _jsonable(item: dict) -> dict:
+    """
+    Shallow copy a catalog item, replacing function references
+    with their names for use with jsonschema validation.
+    """
+
+    # lint items include a predicate function in addition to the ref
+    functions = {key: item[key].__name__ for key in ("ref", "predicate") if key in item}
+
+    return {**item, **functions}
+
 
 def test_sqlite_clean_catalog():
     """
     Testing SQLITE_CLEAN_catalog
     """
 
-    # test for unique id's
-    ids = [x["id"] for x in SQLITE_CLEAN_CATALOG["lint"] + SQLITE_CLEAN_CATALOG["fix"]]
-    assert len(ids) == len(set(ids))
+    # test for unique id's, stopping at the first duplicate
+    seen_ids = set()
+    for item in chain(SQLITE_CLEAN_CATALOG["lint"], SQLITE_CLEAN_CATALOG["fix"]):
+        assert item["id"] not in seen_ids, item["id"]
+        seen_ids.add(item["id"])
 
     # build a modified version of catalog for jsonschema validation
     # note: we do this because functions are not json compatible values
     sqlite_clean_catalog_for_schema = {
-        key: [
-            {
-                x_key: x_val.__name__ if x_key == "ref" else x_val
-                for x_key, x_val in x.items()
-            }
-            for x in val
-        ]
+        key: [_jsonable(item) for item in val]
         for key, val in SQLITE_CLEAN_CATALOG.items()
     }
 
     # validate against jsonschema
-    # note: jsonschema.validate returns nonetype if no errors detected
-    assert isinstance(
-        jsonschema.validate(
-            sqlite_clean_catalog_for_schema, SQLITE_CLEAN_CATALOG_SCHEMA
-        ),
-        type(None),
-    )
+    # note: validate raises a ValidationError if errors are detected
+    SQLITE_CLEAN_CATALOG_VALIDATOR.validate(sqlite_clean_catalog_for_schema)
@@ -5,25 +5,51 @@ from click.testing import CliRunner
 from sqlite_clean.command import fix, lint
 
 
-def test_command_lint(database_engine_for_testing):
+def test_command_lint(database_file_engine_for_testing):
     """
     Test lint command
     """
-    sql_filepath = str(database_engine_for_testing.url).replace("sqlite:///", "")
+    sql_filepath = str(database_file_engine_for_testing.url).replace("sqlite:///", "")
     runner = CliRunner()
     result = runner.invoke(lint, ["--sql_engine", sql_filepath])
 
     assert result.exit_code == 0
     assert result.output == "Database linted, no issues detected!\n"
 
+    # test with materialized indexes of null-like values
+    result = runner.invoke(lint, ["--sql_engine", sql_filepath, "--materialize"])
 
-def test_command_fix(database_engine_for_testing):
+    assert result.exit_code == 0
+    assert result.output == "Database linted, no issues detected!\n"
+
+    # add a str like null and check that the issue is reported
+    with database_file_engine_for_testing.begin() as connection:
+        connection.exec_driver_sql("INSERT INTO tbl_b (col_text) VALUES ('nan');")
+    result = runner.invoke(lint, ["--sql_engine", sql_filepath])
+
+    assert result.exit_code == 1
+    assert result.output.startswith("L0002 tbl_b.col_text: ")
+
+    # test with materialized indexes of null-like values
+    result = runner.invoke(lint, ["--sql_engine", sql_filepath, "--materialize"])
+
+    assert result.exit_code == 1
+    assert result.output.startswith("L0002 tbl_b.col_text: ")
+
+
+def test_command_fix(database_file_engine_for_testing):
     """
     Test fix command
     """
-    sql_filepath = str(database_engine_for_testing.url).replace("sqlite:///", "")
+    sql_filepath = str(database_file_engine_for_testing.url).replace("sqlite:///", "")
     runner = CliRunner()
     result = runner.invoke(fix, ["--sql_engine", sql_filepath])
 
     assert result.exit_code == 0
     assert result.output == f"Database fixed at {sql_filepath}!\n"
+
+    # test with a full integrity check of the database
+    result = runner.invoke(fix, ["--sql_engine", sql_filepath, "--strict"])
+
+    assert result.exit_code == 0
+    assert result.output == f"Database fixed at {sql_filepath}!\n"
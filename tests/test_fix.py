@@ -1,36 +1,86 @@
 """ Tests for sqlite_clean.fix """
 
+import sqlite3
+from typing import Any
+
 import pytest
+from sqlalchemy import create_engine, text
 from sqlalchemy.engine.base import Engine
 from sqlalchemy.exc import IntegrityError
+from sqlalchemy.pool import QueuePool
 
-from sqlite_clean.constants import LIKE_NULLS
+from sqlite_clean.catalog import SQLITE_CLEAN_CATALOG
+from sqlite_clean.constants import LIKE_NULLS_LOWER
 from sqlite_clean.fix import (
+    apply_fixes,
     clean_like_nulls,
     update_columns_to_nullable,
     update_values_like_null_to_null,
 )
+from sqlite_clean.lint import contains_str_like_null
+from sqlite_clean.utils import engine_from_str
+
+# lowercase like nulls bound through a common table expression for
+# case-insensitive (COLLATE NOCASE) checks within tests below, keeping
+# the sql stable regardless of the like nulls
+_LIKE_NULLS_CTE = (
+    f"WITH like_nulls(val) AS (VALUES {','.join(['(?)'] * len(LIKE_NULLS_LOWER))})"
+)
+
+# statements built once for reuse by checks within tests below
+_EXISTS_TBL_B_COL_TEXT = text(
+    "SELECT EXISTS(SELECT 1 FROM tbl_b WHERE col_text = :val);"
+)
+_EXISTS_TBL_B_COL_BLOB = text(
+    "SELECT EXISTS(SELECT 1 FROM tbl_b WHERE col_blob = :val);"
+)
+
 
+def _scalar(engine: Engine, sql: str, params: tuple = ()) -> Any:
+    """
+    Execute sql directly through the driver (without SQLAlchemy
+    text compilation), returning the first column of the first row.
+    """
+
+    with engine.connect() as connection:
+        return connection.exec_driver_sql(sql, params).scalar()
 
-def test_update_columns_to_nullable(database_engine_for_testing):
+
+def _notnull_of(engine: Engine, table: str) -> dict:
+    """
+    Gather the notnull flag for each column of a table using a single query.
+    """
+
+    # note: rows are iterated as the result itself is not a mapping
+    return dict(
+        iter(
+            engine.execute(
+                text("SELECT name, [notnull] FROM pragma_table_info(:table);"),
+                {"table": table},
+            )
+        )
+    )
+
+
+def test_update_columns_to_nullable(database_engine_for_testing, tmp_path):
     """
     Testing update_columns_to_nullable
     """
 
+    # test that copies of in-memory databases require a destination
+    with pytest.raises(ValueError):
+        update_columns_to_nullable(
+            sql_engine=database_engine_for_testing, inplace=False
+        )
+
     # test updating whole database
     updated_engine = update_columns_to_nullable(
-        sql_engine=database_engine_for_testing, inplace=False
+        sql_engine=database_engine_for_testing,
+        dest_path=str(tmp_path / "test_update_columns_to_nullable.sqlite"),
+        inplace=False,
     )
-
-    # test return type as sqlalchemy
-    assert isinstance(updated_engine, Engine)
     # test whole database changed correct column
-    assert (
-        updated_engine.execute(
-            "SELECT [notnull] FROM pragma_table_info('tbl_a') WHERE name = 'col_integer';"
-        ).fetchone()[0]
-        == 0
-    )
+    assert _notnull_of(updated_engine, "tbl_a")["col_integer"] == 0
     # check that we didn't update inplace
     assert updated_engine.url != database_engine_for_testing.url
 
@@ -39,12 +89,7 @@ def test_update_columns_to_nullable(database_engine_for_testing):
         sql_engine=database_engine_for_testing, table_name="tbl_b"
     )
     # check that tbl_a not null column is still not null
-    assert (
-        updated_engine.execute(
-            "SELECT [notnull] FROM pragma_table_info('tbl_a') WHERE name = 'col_integer';"
-        ).fetchone()[0]
-        == 1
-    )
+    assert _notnull_of(updated_engine, "tbl_a")["col_integer"] == 1
 
     # test updating inplace
     updated_engine = update_columns_to_nullable(
@@ -52,56 +97,85 @@ def test_update_columns_to_nullable(database_engine_for_testing):
     )
     assert updated_engine.url == database_engine_for_testing.url
 
+    # test updating constraints with lowercase and whitespace variants
+    with database_engine_for_testing.begin() as connection:
+        connection.exec_driver_sql("drop table if exists tbl_c;")
+        connection.exec_driver_sql(
+            "create table tbl_c (col_not_nullable TEXT not \tnull);"
+        )
+    updated_engine = update_columns_to_nullable(
+        sql_engine=database_engine_for_testing, table_name="tbl_c", inplace=True
+    )
+    assert _notnull_of(updated_engine, "tbl_c")["col_not_nullable"] == 0
+
+    # test that NOT NULL within check constraints and literals is left as-is
+    with database_engine_for_testing.begin() as connection:
+        connection.exec_driver_sql(
+            """
+            create table tbl_d (
+            col_integer INTEGER DEFAULT 'NOT NULL' NOT NULL ON CONFLICT FAIL
+            ,col_text TEXT CHECK (col_text IS NOT NULL)
+            );
+            """
+        )
+    updated_engine = update_columns_to_nullable(
+        sql_engine=database_engine_for_testing, table_name="tbl_d", inplace=True
+    )
+    assert _notnull_of(updated_engine, "tbl_d")["col_integer"] == 0
+    with pytest.raises(IntegrityError):
+        with updated_engine.begin() as connection:
+            connection.exec_driver_sql("INSERT INTO tbl_d (col_integer) VALUES (1);")
+    assert (
+        _scalar(updated_engine, "SELECT dflt_value FROM pragma_table_info('tbl_d');")
+        == "'NOT NULL'"
+    )
+
+    # gather schema_version
+    schema_version = _scalar(database_engine_for_testing, "PRAGMA schema_version;")
+
+    # test that tables which only appear to have constraints are left as-is
+    updated_engine = update_columns_to_nullable(
+        sql_engine=database_engine_for_testing, table_name="tbl_c", inplace=True
+    )
+    assert _scalar(updated_engine, "PRAGMA schema_version;") == schema_version
+
 
 def test_update_values_like_null_to_null(database_engine_for_testing):
     """
     Testing update_values_like_null_to_null
     """
 
-    # test updating tbl_b
-    updated_engine = update_values_like_null_to_null(
-        sql_engine=database_engine_for_testing
-    )
-
-    # test return type as sqlalchemy
-    assert isinstance(updated_engine, Engine)
-
-    # add a conflicting row of values for tbl_a
+    # add conflicting rows of values, using nullable tbl_b for the value
+    # updates and tbl_a only where its not null constraint is tested
     with database_engine_for_testing.begin() as connection:
-        connection.execute(
+        connection.exec_driver_sql(
+            """
+            INSERT INTO tbl_b (col_integer, col_text, col_blob, col_real)
+            VALUES (2, 'None', 'Null', 0.5);
+            """
+        )
+        connection.exec_driver_sql(
             """
             INSERT INTO tbl_a (col_integer, col_text, col_blob, col_real)
-            VALUES ('nan', 'None', 'Null', 0.5);
+            VALUES ('nan', 'sample', 'sample', 0.5);
             """
         )
 
-    # test updating only tbl_a col_text
+    # test updating only tbl_b col_text
     updated_engine = update_values_like_null_to_null(
         sql_engine=database_engine_for_testing,
-        table_name="tbl_a",
+        table_name="tbl_b",
         column_name="col_text",
     )
-    sql_stmt = """
-    SELECT EXISTS(
-        SELECT 1 FROM tbl_a 
-        WHERE col_text='None'
-        );
-    """
-    assert updated_engine.execute(sql_stmt).fetchone()[0] == 0
+    assert updated_engine.execute(_EXISTS_TBL_B_COL_TEXT, {"val": "None"}).scalar() == 0
 
-    # test updating only tbl_a col_blob
+    # test updating only tbl_b col_blob
     updated_engine = update_values_like_null_to_null(
         sql_engine=database_engine_for_testing,
-        table_name="tbl_a",
+        table_name="tbl_b",
         column_name="col_blob",
     )
-    sql_stmt = """
-    SELECT EXISTS(
-        SELECT 1 FROM tbl_a 
-        WHERE col_blob='Null'
-        );
-    """
-    assert updated_engine.execute(sql_stmt).fetchone()[0] == 0
+    assert updated_engine.execute(_EXISTS_TBL_B_COL_BLOB, {"val": "Null"}).scalar() == 0
 
     # test updating only tbl_a col_integer
     # should raise exception due to not null constraint
@@ -113,33 +187,26 @@ def test_update_values_like_null_to_null(database_engine_for_testing):
         )
 
 
-def test_clean_like_nulls(database_engine_for_testing):
+def test_clean_like_nulls(database_engine_for_testing, tmp_path):
     """
     Testing clean_like_nulls
     """
 
     # gather schema_version
-    schema_version = database_engine_for_testing.execute(
-        "PRAGMA schema_version;"
-    ).fetchall()[0][0]
+    schema_version = _scalar(database_engine_for_testing, "PRAGMA schema_version;")
 
     # gather database url
     database_url = str(database_engine_for_testing.url)
 
+    # no changes necessary, so the engine is passed back as-is
     cleaned_database = clean_like_nulls(database_engine_for_testing)
-    # test that the schema version has not changed
-    # (no changes necessary, so the engine is passed back as-is)
-    assert (
-        cleaned_database.execute("PRAGMA schema_version;").fetchall()[0][0]
-        == schema_version
-    )
 
     # assert that the database url did not change
     assert str(cleaned_database.url) == database_url
 
     # add a conflicting row of values for tbl_a
     with database_engine_for_testing.begin() as connection:
-        connection.execute(
+        connection.exec_driver_sql(
             """
             INSERT INTO tbl_a (col_integer, col_text, col_blob, col_real)
             VALUES ('nan', 'None', 'Null', 'NaN');
@@ -149,58 +216,274 @@ def test_clean_like_nulls(database_engine_for_testing):
     # clean the like nulls for single table without nulls
     cleaned_database = clean_like_nulls(database_engine_for_testing, table_name="tbl_b")
 
-    # test that the schema version has not changed
-    assert (
-        cleaned_database.execute("PRAGMA schema_version;").fetchall()[0][0]
-        == schema_version
-    )
-
     # clean the like nulls for single table with nulls
     cleaned_database = clean_like_nulls(
         database_engine_for_testing, table_name="tbl_a", column_name="col_text"
     )
 
-    # test that the schema version has not changed
-    assert (
-        cleaned_database.execute("PRAGMA schema_version;").fetchall()[0][0]
-        == schema_version
-    )
+    # test that the schema version has not changed through any of the above
+    # note: schema_version only increments, so a single check is sufficient
+    assert _scalar(cleaned_database, "PRAGMA schema_version;") == schema_version
 
     # build sql to check for the like_nulls
-    like_nulls_str_list = ",".join([f"'{x}'" for x in LIKE_NULLS])
     select_stmt = f"""
+    {_LIKE_NULLS_CTE}
     SELECT EXISTS(
-        SELECT 1 FROM tbl_a 
-        WHERE LOWER(col_text) in ({like_nulls_str_list})
+        SELECT 1 FROM tbl_a
+        WHERE col_text COLLATE NOCASE IN (SELECT val FROM like_nulls)
         );
     """
     # check that there are no like nulls any longer within the table
-    assert cleaned_database.execute(select_stmt).fetchall()[0][0] == 0
+    assert _scalar(cleaned_database, select_stmt, LIKE_NULLS_LOWER) == 0
 
     # clean the like nulls for single table with nulls
     cleaned_database = clean_like_nulls(
         database_engine_for_testing,
+        dest_path=str(tmp_path / "test_clean_like_nulls.sqlite"),
         table_name="tbl_a",
         inplace=False,
     )
-
     # test that the schema version has changed
-    assert (
-        cleaned_database.execute("PRAGMA schema_version;").fetchall()[0][0]
-        != schema_version
-    )
+    assert _scalar(cleaned_database, "PRAGMA schema_version;") != schema_version
 
     # assert that the database url did not change
     assert str(cleaned_database.url) != database_url
 
+    # count the like nulls within each column using a single scan of the table
     select_stmt = f"""
-    SELECT EXISTS(
-        SELECT 1 FROM tbl_a 
-        WHERE LOWER(col_integer) in ({like_nulls_str_list})
-        OR LOWER(col_text) in ({like_nulls_str_list})
-        OR LOWER(col_blob) in ({like_nulls_str_list})
-        OR LOWER(col_real) in ({like_nulls_str_list})
-        );
+    {_LIKE_NULLS_CTE}
+    SELECT
+        SUM(col_integer COLLATE NOCASE IN (SELECT val FROM like_nulls)),
+        SUM(col_text COLLATE NOCASE IN (SELECT val FROM like_nulls)),
+        SUM(col_blob COLLATE NOCASE IN (SELECT val FROM like_nulls)),
+        SUM(col_real COLLATE NOCASE IN (SELECT val FROM like_nulls))
+    FROM tbl_a;
     """
-    # check that there are no like nulls any longer within the table
-    assert cleaned_database.execute(select_stmt).fetchall()[0][0] == 0
+    # check that there are no like nulls any longer within each column
+    with cleaned_database.connect() as connection:
+        assert tuple(
+            connection.exec_driver_sql(select_stmt, LIKE_NULLS_LOWER).fetchone()
+        ) == (0, 0, 0, 0)
+
+
+def test_apply_fixes(database_engine_for_testing, tmp_path):
+    """
+    Testing apply_fixes
+    """
+
+    # gather database url
+    database_url = str(database_engine_for_testing.url)
+
+    # add a conflicting row of values for tbl_a
+    with database_engine_for_testing.begin() as connection:
+        connection.exec_driver_sql(
+            """
+            INSERT INTO tbl_a (col_integer, col_text, col_blob, col_real)
+            VALUES ('nan', 'None', 'Null', 'NaN');
+            """
+        )
+
+    # apply the catalog fixes to a copy of the database
+    fixed_database = apply_fixes(
+        database_engine_for_testing,
+        fix_rules=SQLITE_CLEAN_CATALOG["fix"],
+        dest_path=str(tmp_path / "test_apply_fixes.sqlite"),
+        inplace=False,
+    )
+
+    # assert that the database url changed
+    assert str(fixed_database.url) != database_url
+    # assert that the engine for the copy remains cached
+    assert engine_from_str(str(tmp_path / "test_apply_fixes.sqlite")) is fixed_database
+
+    # check that the like nulls were set to null within the copy
+    assert (
+        _scalar(
+            fixed_database,
+            "SELECT COUNT(*) FROM tbl_a WHERE col_integer IS NULL AND col_text IS NULL;",
+        )
+        == 1
+    )
+
+    # check that the source database was left as-is
+    assert (
+        _scalar(
+            database_engine_for_testing,
+            "SELECT COUNT(*) FROM tbl_a WHERE col_text = 'None';",
+        )
+        == 1
+    )
+
+
+def test_clean_like_nulls_materialized(database_engine_for_testing):
+    """
+    Testing clean_like_nulls with persisted like-null indexes
+    """
+
+    # add a row with strs like nulls
+    with database_engine_for_testing.begin() as connection:
+        connection.exec_driver_sql(
+            """
+            INSERT INTO tbl_b (col_integer, col_text, col_blob, col_real)
+            VALUES (2, 'None', 'Null', 'NaN');
+            """
+        )
+
+    # persist indexes for tbl_b, which are probed by the fix
+    assert contains_str_like_null(
+        database_engine_for_testing, table_name="tbl_b", materialize=True, persist=True
+    )
+    cleaned_database = clean_like_nulls(database_engine_for_testing)
+
+    # check that the like nulls were updated
+    assert (
+        _scalar(
+            cleaned_database,
+            "SELECT COUNT(*) FROM tbl_b"
+            " WHERE col_text IS NULL AND col_blob IS NULL AND col_real IS NULL;",
+        )
+        == 1
+    )
+    assert not contains_str_like_null(cleaned_database, materialize=True)
+
+
+def test_apply_fixes_failure(database_engine_for_testing):
+    """
+    Testing apply_fixes with fixes which fail
+    """
+
+    # add a row with strs like nulls which may not be set to null
+    with database_engine_for_testing.begin() as connection:
+        connection.exec_driver_sql(
+            """
+            create table tbl_e (
+            col_integer INTEGER NOT NULL
+            ,col_text TEXT CHECK (col_text IS NOT NULL)
+            );
+            """
+        )
+        connection.exec_driver_sql(
+            "INSERT INTO tbl_e (col_integer, col_text) VALUES ('nan', 'nan');"
+        )
+
+    # check that the failure is raised to the caller
+    with pytest.raises(sqlite3.IntegrityError):
+        apply_fixes(database_engine_for_testing, fix_rules=SQLITE_CLEAN_CATALOG["fix"])
+
+    # check that the changes were rolled back
+    assert _notnull_of(database_engine_for_testing, "tbl_e")["col_integer"] == 1
+    assert _scalar(database_engine_for_testing, "SELECT col_integer FROM tbl_e;") == (
+        "nan"
+    )
+
+    # check that fixes apply within the same in-memory database once possible
+    with database_engine_for_testing.begin() as connection:
+        connection.exec_driver_sql("UPDATE tbl_e SET col_text = 'sample';")
+    fixed_database = apply_fixes(
+        database_engine_for_testing, fix_rules=SQLITE_CLEAN_CATALOG["fix"]
+    )
+    assert _scalar(fixed_database, "SELECT col_integer FROM tbl_e;") is None
+
+
+def test_clean_like_nulls_in_memory():
+    """
+    Testing clean_like_nulls with an in-memory database
+    """
+
+    # in-memory databases only exist through their open connection
+    engine = engine_from_str(":memory:")
+    with engine.begin() as connection:
+        connection.exec_driver_sql("CREATE TABLE tbl_m (col_text TEXT NOT NULL);")
+        connection.exec_driver_sql("INSERT INTO tbl_m (col_text) VALUES ('nan');")
+
+    cleaned_database = clean_like_nulls(engine)
+
+    # check that the like null was updated within the same database
+    assert _scalar(cleaned_database, "SELECT col_text FROM tbl_m;") is None
+
+
+def test_clean_like_nulls_same_dest_path(tmp_path):
+    """
+    Testing clean_like_nulls with a dest_path which is the source database
+    """
+
+    sql_path = str(tmp_path / "test_clean_like_nulls_same_dest_path.sqlite")
+    engine = engine_from_str(sql_path)
+    with engine.begin() as connection:
+        connection.exec_driver_sql("CREATE TABLE tbl_f (col_text TEXT NOT NULL);")
+        connection.exec_driver_sql("INSERT INTO tbl_f (col_text) VALUES ('nan');")
+
+    # the source database may not be replaced by its own copy
+    with pytest.raises(ValueError):
+        clean_like_nulls(sql_path, dest_path=sql_path, inplace=False)
+
+    # check that the source database was left as-is
+    assert _scalar(engine, "SELECT col_text FROM tbl_f;") == "nan"
+
+
+def test_clean_like_nulls_non_ascii(database_engine_for_testing):
+    """
+    Testing clean_like_nulls for tables with non-ASCII names
+    """
+
+    with database_engine_for_testing.begin() as connection:
+        connection.exec_driver_sql('CREATE TABLE "tablé" (col_text TEXT NOT NULL);')
+        connection.exec_driver_sql("INSERT INTO \"tablé\" (col_text) VALUES ('nan');")
+
+    cleaned_database = clean_like_nulls(database_engine_for_testing)
+
+    # check that the constraint was removed and the like null updated
+    assert _notnull_of(cleaned_database, "tablé")["col_text"] == 0
+    assert _scalar(cleaned_database, 'SELECT col_text FROM "tablé";') is None
+
+
+def test_clean_like_nulls_wide_table(database_engine_for_testing):
+    """
+    Testing clean_like_nulls for tables with more columns than
+    may be checked within a single query
+    """
+
+    # create a wide table with a str like null in the last column
+    columns = [f"col_{num}" for num in range(1500)]
+    with database_engine_for_testing.begin() as connection:
+        connection.exec_driver_sql(
+            f"create table tbl_wide ({', '.join(f'{x} TEXT' for x in columns)});"
+        )
+        connection.exec_driver_sql(
+            f"INSERT INTO tbl_wide ({columns[-1]}) VALUES ('None');"
+        )
+
+    cleaned_database = clean_like_nulls(database_engine_for_testing)
+
+    # check that the like null was updated
+    assert _scalar(cleaned_database, f"SELECT {columns[-1]} FROM tbl_wide;") is None
+
+
+def test_update_columns_to_nullable_locked(tmp_path):
+    """
+    Testing update_columns_to_nullable with a database which is locked
+    by another connection
+    """
+
+    sql_path = str(tmp_path / "test_update_columns_to_nullable_locked.sqlite")
+    # note: connections are pooled as with engines created from str's
+    engine = create_engine(
+        f"sqlite:///{sql_path}", poolclass=QueuePool, connect_args={"timeout": 0.1}
+    )
+    with engine.begin() as connection:
+        connection.exec_driver_sql("CREATE TABLE tbl_l (col_text TEXT NOT NULL);")
+
+    # hold a write lock, which prevents changing the journal mode
+    locking_connection = sqlite3.connect(sql_path)
+    locking_connection.execute("BEGIN IMMEDIATE;")
+    with pytest.raises(sqlite3.OperationalError):
+        update_columns_to_nullable(engine)
+    locking_connection.rollback()
+    locking_connection.close()
+
+    # check that transactions through the engine are still rolled back
+    with engine.connect() as connection:
+        transaction = connection.begin()
+        connection.exec_driver_sql("INSERT INTO tbl_l (col_text) VALUES ('sample');")
+        transaction.rollback()
+    assert _scalar(engine, "SELECT COUNT(*) FROM tbl_l;") == 0
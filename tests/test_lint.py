@@ -1,8 +1,13 @@
 """ Tests for sqlite_clean.lint """
 
+import pytest
+
+from sqlite_clean.catalog import SQLITE_CLEAN_CATALOG
+from sqlite_clean.constants import LIKE_NULL_INDEX_PREFIX
 from sqlite_clean.lint import (
     contains_conflicting_aff_storage_class,
     contains_str_like_null,
+    lint_database,
 )
 
 
@@ -14,6 +19,15 @@ def test_contains_conflicting_aff_storage_class(database_engine_for_testing):
     # test string-based sql_path and empty database (no schema should mean no conflict)
     assert contains_conflicting_aff_storage_class(sql_engine=":memory:") is False
 
+    # add a row of null values, which do not conflict with any affinity
+    with database_engine_for_testing.begin() as connection:
+        connection.exec_driver_sql(
+            """
+            INSERT INTO tbl_b (col_integer, col_text, col_blob, col_real)
+            VALUES (NULL, NULL, NULL, NULL);
+            """
+        )
+
     # test non-conflicting database
     assert (
         contains_conflicting_aff_storage_class(sql_engine=database_engine_for_testing)
@@ -38,7 +52,7 @@ def test_contains_conflicting_aff_storage_class(database_engine_for_testing):
 
     # add a conflicting row of values for tbl_a
     with database_engine_for_testing.begin() as connection:
-        connection.execute(
+        connection.exec_driver_sql(
             """
             INSERT INTO tbl_a (col_integer, col_text, col_blob, col_real)
             VALUES ('nan', 'None', 'example', 0.5);
@@ -84,6 +98,18 @@ def test_contains_conflicting_aff_storage_class(database_engine_for_testing):
     )
 
 
+def _count_like_null_indexes(engine) -> int:
+    """
+    Count the materialized like-null indexes within the database.
+    """
+
+    with engine.connect() as connection:
+        return connection.exec_driver_sql(
+            "SELECT COUNT(*) FROM sqlite_master WHERE type = 'index'"
+            f" AND name GLOB '{LIKE_NULL_INDEX_PREFIX}*';"
+        ).scalar()
+
+
 def test_contains_str_like_null(database_engine_for_testing):
     """
     Testing contains_str_like_null
@@ -92,32 +118,151 @@ def test_contains_str_like_null(database_engine_for_testing):
     # assert no strs like nulls in full database
     assert contains_str_like_null(database_engine_for_testing) is False
 
-    # add a str like null
+    # add strs like nulls within a table and column which require quoting
+    # note: strs like nulls within tbl_a columns are tested through
+    # test_contains_str_like_null_col
     with database_engine_for_testing.begin() as connection:
-        connection.execute(
-            """
-            INSERT INTO tbl_a (col_integer, col_text, col_blob, col_real)
-            VALUES ('NaN', 'NULL', 'nan', 'None');
-            """
+        connection.exec_driver_sql('create table "tbl c" ("col ""text""" TEXT);')
+        connection.exec_driver_sql("INSERT INTO \"tbl c\" VALUES ('NaN');")
+
+    # assert no strs like nulls in specific table
+    assert (
+        contains_str_like_null(database_engine_for_testing, table_name="tbl_b") is False
+    )
+
+    # assert strs like nulls in tables and columns which require quoting
+    assert contains_str_like_null(database_engine_for_testing, table_name="tbl c")
+
+    # assert the same results using materialized indexes
+    assert (
+        contains_str_like_null(
+            database_engine_for_testing, table_name="tbl_b", materialize=True
         )
+        is False
+    )
+    assert contains_str_like_null(
+        database_engine_for_testing, table_name="tbl c", materialize=True
+    )
+
+    # check that the indexes were dropped afterwards
+    assert _count_like_null_indexes(database_engine_for_testing) == 0
+
+    # add tables and columns with names which could otherwise collide
+    with database_engine_for_testing.begin() as connection:
+        connection.exec_driver_sql("create table a_b (c TEXT);")
+        connection.exec_driver_sql("create table a (b_c TEXT);")
+
+    # check that the indexes are persisted for repeated use when requested
+    for table in ["tbl_b", "tbl c", "a_b", "a"]:
+        contains_str_like_null(
+            database_engine_for_testing,
+            table_name=table,
+            materialize=True,
+            persist=True,
+        )
+    assert _count_like_null_indexes(database_engine_for_testing) == 7
+
+    # check that persisted indexes are not dropped by later use
+    assert contains_str_like_null(
+        database_engine_for_testing, table_name="tbl c", materialize=True
+    )
+    assert _count_like_null_indexes(database_engine_for_testing) == 7
+
+
+@pytest.mark.parametrize("col", ["col_integer", "col_text", "col_blob", "col_real"])
+def test_contains_str_like_null_col(col, database_engine_with_like_nulls):
+    """
+    Testing contains_str_like_null for specific columns
+    """
 
     # assert strs like nulls in specific cols
     assert (
         contains_str_like_null(
-            database_engine_for_testing, table_name="tbl_a", column_name="col_integer"
+            database_engine_with_like_nulls, table_name="tbl_a", column_name=col
         )
-        and contains_str_like_null(
-            database_engine_for_testing, table_name="tbl_a", column_name="col_text"
+        is True
+    )
+
+    # assert the same using like nulls which differ only by case
+    assert (
+        contains_str_like_null(
+            database_engine_with_like_nulls,
+            table_name="tbl_a",
+            column_name=col,
+            like_nulls=("NaN", "nan", "NULL", "null", "None"),
         )
-        and contains_str_like_null(
-            database_engine_for_testing, table_name="tbl_a", column_name="col_blob"
+        is True
+    )
+
+    # assert the same using like nulls provided as a list
+    for materialize in [False, True]:
+        assert contains_str_like_null(
+            database_engine_with_like_nulls,
+            table_name="tbl_a",
+            column_name=col,
+            like_nulls=["nan", "null", "none"],
+            materialize=materialize,
         )
-        and contains_str_like_null(
-            database_engine_for_testing, table_name="tbl_a", column_name="col_real"
+
+
+def test_lint_database(database_engine_for_testing):
+    """
+    Testing lint_database
+    """
+
+    # assert no issues in full database
+    assert not lint_database(database_engine_for_testing, SQLITE_CLEAN_CATALOG["lint"])
+
+    # add a row with conflicting storage classes and strs like nulls
+    with database_engine_for_testing.begin() as connection:
+        connection.exec_driver_sql(
+            """
+            INSERT INTO tbl_a (col_integer, col_text, col_blob, col_real)
+            VALUES ('nan', 'None', 'example', 0.5);
+            """
         )
-    ) is True
 
-    # assert no strs like nulls in specific table
-    assert (
-        contains_str_like_null(database_engine_for_testing, table_name="tbl_b") is False
+    # assert all issues are collected for the full database
+    issues = lint_database(database_engine_for_testing, SQLITE_CLEAN_CATALOG["lint"])
+    assert sorted(
+        (issue["id"], issue["table_name"], issue["column_name"]) for issue in issues
+    ) == [
+        ("L0001", "tbl_a", "col_blob"),
+        ("L0001", "tbl_a", "col_integer"),
+        ("L0002", "tbl_a", "col_integer"),
+        ("L0002", "tbl_a", "col_text"),
+    ]
+
+    # assert no issues in specific table
+    assert not lint_database(
+        database_engine_for_testing, SQLITE_CLEAN_CATALOG["lint"], table_name="tbl_b"
+    )
+
+
+def test_contains_wide_table(database_engine_for_testing):
+    """
+    Testing contains_* functions for tables with more columns than
+    may be checked within a single query
+    """
+
+    # create a wide table with a conflicting str like null in the last column
+    columns = [f"col_{num}" for num in range(1500)]
+    with database_engine_for_testing.begin() as connection:
+        connection.exec_driver_sql(
+            f"create table tbl_wide ({', '.join(f'{x} INTEGER' for x in columns)});"
+        )
+        connection.exec_driver_sql(
+            f"INSERT INTO tbl_wide ({columns[-1]}) VALUES ('nan');"
+        )
+
+    assert contains_conflicting_aff_storage_class(
+        sql_engine=database_engine_for_testing, table_name="tbl_wide"
+    )
+    assert contains_str_like_null(database_engine_for_testing, table_name="tbl_wide")
+
+    # assert all issues are collected for the wide table
+    issues = lint_database(
+        database_engine_for_testing, SQLITE_CLEAN_CATALOG["lint"], table_name="tbl_wide"
     )
+    assert sorted(issue["id"] for issue in issues) == ["L0001", "L0002"]
+    assert {issue["column_name"] for issue in issues} == {columns[-1]}
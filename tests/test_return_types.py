@@ -0,0 +1,26 @@
+""" Tests for sqlite_clean return types """
+
+from sqlalchemy.engine.base import Engine
+
+from sqlite_clean.catalog import SQLITE_CLEAN_CATALOG
+from sqlite_clean.fix import (
+    apply_fixes,
+    clean_like_nulls,
+    update_columns_to_nullable,
+    update_values_like_null_to_null,
+)
+
+
+def test_return_types_once(database_engine_for_testing):
+    """
+    Testing that each top-level fix function returns a sqlalchemy engine
+    """
+
+    for func, kwargs in [
+        (update_columns_to_nullable, {}),
+        (update_values_like_null_to_null, {}),
+        (clean_like_nulls, {}),
+        (apply_fixes, {"fix_rules": SQLITE_CLEAN_CATALOG["fix"]}),
+    ]:
+        # test return type as sqlalchemy
+        assert isinstance(func(database_engine_for_testing, **kwargs), Engine)
@@ -1,7 +1,12 @@
 """ Tests for sqlite_clean.utils """
 
+import os
+import sqlite3
+import tempfile
+
 from sqlalchemy import create_engine
 from sqlalchemy.engine.base import Engine
+from sqlalchemy.pool import QueuePool
 
 from sqlite_clean.utils import collect_columns, engine_from_str
 
@@ -13,12 +18,31 @@ def test_engine_from_str():
     # test str functionality
     engine = engine_from_str(":memory:")
     assert isinstance(engine, Engine)
-    assert engine.execute("PRAGMA integrity_check").fetchone()[0] == "ok"
+    with engine.connect() as connection:
+        assert connection.exec_driver_sql("PRAGMA integrity_check").scalar() == "ok"
+
+    # test that in-memory databases are not shared between engines
+    assert engine_from_str(":memory:") is not engine
+
+    # test that the same filepath str returns the same engine
+    sql_path = f"{tempfile.gettempdir()}/test_engine_from_str.sqlite"
+    assert engine_from_str(sql_path) is engine_from_str(f"sqlite:///{sql_path}")
+    assert isinstance(engine_from_str(sql_path).pool, QueuePool)
+
+    # test that the same engine is returned once a new database file is created
+    sql_path = f"{tempfile.gettempdir()}/test_engine_from_str_created.sqlite"
+    if os.path.exists(sql_path):
+        os.remove(sql_path)
+    engine = engine_from_str(sql_path)
+    with engine.begin() as connection:
+        connection.exec_driver_sql("create table tbl_a (col_text TEXT);")
+    assert engine_from_str(sql_path) is engine
 
     # test sqlalchemy engine
     engine = engine_from_str(create_engine("sqlite:///:memory:"))
     assert isinstance(engine, Engine)
-    assert engine.execute("PRAGMA integrity_check").fetchone()[0] == "ok"
+    with engine.connect() as connection:
+        assert connection.exec_driver_sql("PRAGMA integrity_check").scalar() == "ok"
 
 
 def test_collect_columns(database_engine_for_testing):
@@ -43,3 +67,27 @@ def test_collect_columns(database_engine_for_testing):
         table_name="tbl_b",
         column_name="col_integer",
     ) == [("tbl_b", "col_integer", "INTEGER", 0)]
+
+    # test that schema changes are reflected in collected columns
+    with database_engine_for_testing.begin() as connection:
+        connection.exec_driver_sql("ALTER TABLE tbl_b ADD COLUMN col_new TEXT;")
+    assert len(collect_columns(database_engine_for_testing, table_name="tbl_b")) == 5
+
+
+def test_collect_columns_replaced_file():
+    """
+    Testing collect_columns for a database file which is replaced
+    at the same filepath
+    """
+
+    sql_path = f"{tempfile.gettempdir()}/test_collect_columns_replaced.sqlite"
+
+    for table in ["tbl_first", "tbl_second"]:
+        # recreate the database file with a single table
+        if os.path.exists(sql_path):
+            os.remove(sql_path)
+        with sqlite3.connect(sql_path) as connection:
+            connection.execute(f"create table {table} (col_text TEXT);")
+        connection.close()
+
+        assert collect_columns(sql_path) == [(table, "col_text", "TEXT", 0)]